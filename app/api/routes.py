@@ -1,16 +1,31 @@
 # ===========================
 # app/api/routes.py
 # ===========================
-from fastapi import APIRouter, HTTPException, BackgroundTasks
-from fastapi.responses import FileResponse
+from fastapi import APIRouter, HTTPException, BackgroundTasks, Request, Depends, Header, Query
+from fastapi.responses import FileResponse, StreamingResponse, PlainTextResponse
+from fastapi.encoders import jsonable_encoder
+from starlette.background import BackgroundTask
 from datetime import datetime
+import asyncio
 import logging
 import tempfile
 import json
 import os
+import secrets
+import sys
 
-from app.models.schemas import ScrapeRequest, ScrapeResponse, HealthResponse
+from typing import List, Optional
+
+from app.models.schemas import ScrapeRequest, BatchScrapeRequest, ScrapeResponse, HealthResponse, ProfileFormat
 from app.core.scraper import WebScraper
+from app.core.admission import admission_controller
+from app.core.browser import browser_pool
+from app.core.config import settings
+from app.core.resolver import dns_cache
+from app.core.profiler import profiler, ProfilerBusyError
+from app.core.shared_state import shared_state
+from app.core.link_graph import link_graph
+from app.core.robots import robots_cache
 from app.utils.file_handler import FileHandler
 from app.core.exceptions import ScrapingException, create_http_exception
 
@@ -20,20 +35,37 @@ logger = logging.getLogger(__name__)
 # Global scraper instance
 scraper = WebScraper()
 
+def client_identifier(raw_request: Request) -> str:
+    """Identify the calling client for per-client admission limits
+
+    X-Forwarded-For is not read here: anyone can send it. Behind a reverse
+    proxy, list the proxy in uvicorn's --forwarded-allow-ips
+    (FORWARDED_ALLOW_IPS) and uvicorn puts the forwarded client address in
+    request.client for requests that come from that proxy.
+    """
+    return raw_request.client.host if raw_request.client else "unknown"
+
 @router.post("/scrape", response_model=ScrapeResponse)
-async def scrape_website(request: ScrapeRequest, background_tasks: BackgroundTasks):
+async def scrape_website(request: ScrapeRequest, background_tasks: BackgroundTasks, raw_request: Request):
     """
     Scrape a website and return structured data
     
     - **url**: The URL to scrape
     - **options**: List of data types to extract (text, links, images, headings, meta, forms)
+    - **render_js**: Load the page in a headless browser first (needs JS_RENDER_ENABLED)
+    - **render_options**: Readiness conditions for rendering (wait_until, wait_for_selector, timeout)
+    - **respect_robots**: Override the server's robots.txt policy for this request
+    
+    Returns 429 or 503 with a Retry-After header when the scraper is at capacity.
     """
     try:
         url_str = str(request.url)
         logger.info(f"Scraping request for: {url_str}")
         
-        # Perform scraping
-        result = await scraper.scrape(url_str, request.options)
+        # Perform scraping once admitted
+        async with admission_controller.slot(client_identifier(raw_request)):
+            result = await scraper.scrape(url_str, request.options, request.render_settings(), request.respect_robots)
+        record_outcome(result)
         
         # Save result in background if successful
         if result.success:
@@ -50,14 +82,168 @@ async def scrape_website(request: ScrapeRequest, background_tasks: BackgroundTas
     except Exception as e:
         logger.error(f"Unexpected error in scrape_website: {e}")
         raise HTTPException(status_code=500, detail="Internal server error")
+    finally:
+        profiler.request_finished()
+
+@router.post("/scrape/batch", response_model=List[ScrapeResponse])
+async def scrape_batch(request: BatchScrapeRequest, background_tasks: BackgroundTasks, raw_request: Request):
+    """
+    Scrape up to 100 URLs with the same options
+    
+    Distinct hostnames are resolved concurrently before any fetch starts.
+    Each URL goes through admission control on its own; URLs that are shed
+    come back as failed results rather than failing the whole batch.
+    
+    URLs on the same host are scraped one at a time, RATE_LIMIT_PER_MINUTE
+    apart, so with the default of 60 a batch of 100 URLs on one host takes
+    about 100 seconds.
+    """
+    client_id = client_identifier(raw_request)
+    urls = [str(url) for url in request.urls]
+    logger.info(f"Batch scraping request for {len(urls)} URLs")
+    
+    results = await scraper.scrape_batch(
+        urls,
+        request.options,
+        request.render_settings(),
+        concurrency=settings.max_scrapes_per_client,
+        admit=lambda: admission_controller.slot(client_id),
+        respect_robots=request.respect_robots
+    )
+    
+    for result in results:
+        record_outcome(result)
+        if result.success:
+            background_tasks.add_task(save_result_background, result.dict())
+    
+    return results
+
+@router.post("/scrape/stream")
+async def scrape_website_stream(request: ScrapeRequest, raw_request: Request):
+    """
+    Scrape a website and stream partial results as Server-Sent Events
+    
+    - **fetch**: status code, response size and fetch time once the page is downloaded
+    - **result**: one event per option as soon as its extractor finishes
+    - **complete**: the full ScrapeResponse, including final stats
+    """
+    url_str = str(request.url)
+    logger.info(f"Streaming scrape request for: {url_str}")
+    
+    # Admit before the stream starts so overload is reported as a plain 429/503
+    try:
+        slot = await admission_controller.acquire(client_identifier(raw_request))
+    except ScrapingException as e:
+        logger.warning(f"Streaming scrape rejected: {e.message}")
+        raise create_http_exception(e)
+    
+    async def event_stream():
+        slot.activate()
+        try:
+            async for event, payload in scraper.scrape_stream(url_str, request.options, request.render_settings(), request.respect_robots):
+                yield format_sse(event, payload)
+                
+                if event == "complete":
+                    record_outcome(payload)
+                    if payload.success:
+                        await save_result_background(payload.dict())
+        finally:
+            slot.release()
+    
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Also frees the slot if the stream is abandoned before it starts
+        background=BackgroundTask(slot.release)
+    )
+
+def format_sse(event: str, payload) -> str:
+    """Encode a payload as a single Server-Sent Event frame"""
+    data = json.dumps(jsonable_encoder(payload), ensure_ascii=False)
+    return f"event: {event}\ndata: {data}\n\n"
+
+@router.post("/replay", response_model=ScrapeResponse)
+async def replay_website(request: ScrapeRequest, background_tasks: BackgroundTasks):
+    """
+    Re-run extraction on the archived response for a URL, without refetching it
+    
+    Requires responses to have been archived with ARCHIVE_RESPONSES enabled.
+    """
+    url_str = str(request.url)
+    logger.info(f"Replay request for: {url_str}")
+    
+    result = await scraper.replay(url_str, request.options)
+    
+    if result.success:
+        background_tasks.add_task(save_result_background, result.dict())
+    
+    return result
+
+def record_outcome(result: ScrapeResponse):
+    """Count a finished scrape in the counters shared by all workers"""
+    shared_state.incr("scrapes_total")
+    shared_state.incr("scrapes_succeeded" if result.success else "scrapes_failed")
+
+def process_metrics() -> dict:
+    """Metrics kept by this worker process"""
+    return {
+        "admission": admission_controller.stats(),
+        "browser_pool": browser_pool.stats(),
+        "dns": dns_cache.stats(),
+        "robots": robots_cache.stats()
+    }
 
 async def save_result_background(result_data: dict):
-    """Background task to save scraping results"""
+    """Background task to save scraping results and index them by URL"""
     try:
-        await FileHandler.save_json(result_data)
+        with profiler.stage('save'):
+            filepath = await FileHandler.save_json(result_data)
+            await asyncio.to_thread(shared_state.record_result, str(result_data["url"]), filepath)
         logger.info("Scraping result saved successfully")
     except Exception as e:
         logger.warning(f"Failed to save scraping result: {e}")
+    
+    if settings.link_graph_enabled:
+        await index_links(result_data)
+
+async def index_links(result_data: dict):
+    """Add a saved page's links to the link graph, starting a compaction when due"""
+    url = str(result_data["url"])
+    links = (result_data.get("data") or {}).get("links")
+    
+    try:
+        with profiler.stage('index_links'):
+            if links is None:
+                # Links were not extracted; keep the page's known out-links
+                await asyncio.to_thread(link_graph.mark_status, url, True)
+                return
+            
+            due = await asyncio.to_thread(link_graph.add_page, url, [str(link["absolute_url"]) for link in links])
+        if due:
+            await start_compaction()
+    except Exception as e:
+        logger.warning(f"Failed to update link graph for {url}: {e}")
+
+# Compaction process started by this worker, if one is running
+_compaction: Optional[asyncio.Task] = None
+
+async def start_compaction():
+    """Compact the link graph in a separate process, unless one is already compacting"""
+    global _compaction
+    if _compaction is not None and not _compaction.done():
+        return
+    if await asyncio.to_thread(link_graph.compacting):
+        return
+    
+    process = await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "app.cli.compact_links", "--dir", str(link_graph.directory)
+    )
+    _compaction = asyncio.create_task(wait_for_compaction(process))
+
+async def wait_for_compaction(process: asyncio.subprocess.Process):
+    if await process.wait() != 0:
+        logger.warning(f"Link graph compaction exited with status {process.returncode}")
 
 @router.post("/download")
 async def download_json(request: dict):
@@ -102,16 +288,129 @@ async def get_stats():
     try:
         # Count scraped files
         from pathlib import Path
-        from app.core.config import settings
         
         scraped_dir = Path(settings.scraped_dir)
         file_count = len(list(scraped_dir.glob("*.json"))) if scraped_dir.exists() else 0
         
+        # Publish this worker's numbers first so the worker list includes them
+        metrics = process_metrics()
+        await asyncio.to_thread(shared_state.publish_metrics, metrics)
+        
         return {
             "total_scrapes": file_count,
             "status": "operational",
+            **metrics,
+            "counters": await asyncio.to_thread(shared_state.counters),
+            "workers": await asyncio.to_thread(shared_state.worker_metrics),
+            "link_graph": await asyncio.to_thread(link_graph.stats) if settings.link_graph_enabled else None,
+            "worker_pid": os.getpid(),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
         logger.error(f"Error getting stats: {e}")
-        raise HTTPException(status_code=500, detail="Failed to get statistics")
\ No newline at end of file
+        raise HTTPException(status_code=500, detail="Failed to get statistics")
+
+@router.get("/results/latest")
+async def latest_result(url: str = Query(..., description="URL as it appears in the result's url field")):
+    """Return the most recently saved result for a URL, whichever worker saved it"""
+    entry = await asyncio.to_thread(shared_state.latest_result, url)
+    if entry is None:
+        raise HTTPException(status_code=404, detail="No saved result for this URL")
+    
+    try:
+        return await FileHandler.load_json(entry["path"])
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Saved result file no longer exists")
+
+def link_graph_enabled():
+    if not settings.link_graph_enabled:
+        raise HTTPException(status_code=404, detail="Link graph is disabled")
+
+@router.get("/links/out", dependencies=[Depends(link_graph_enabled)])
+async def get_out_links(
+    url: str = Query(..., description="Page URL"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """Pages the given page links to, as of its last saved scrape"""
+    links = await asyncio.to_thread(link_graph.out_links, url, limit, offset)
+    if links is None:
+        raise HTTPException(status_code=404, detail="URL is not in the link graph")
+    return links
+
+@router.get("/links/in", dependencies=[Depends(link_graph_enabled)])
+async def get_in_links(
+    url: str = Query(..., description="Page URL"),
+    limit: int = Query(100, ge=1, le=1000),
+    offset: int = Query(0, ge=0)
+):
+    """Scraped pages that link to the given URL"""
+    links = await asyncio.to_thread(link_graph.in_links, url, limit, offset)
+    if links is None:
+        raise HTTPException(status_code=404, detail="URL is not in the link graph")
+    return links
+
+@router.get("/links/degree", dependencies=[Depends(link_graph_enabled)])
+async def get_link_degree(url: str = Query(..., description="Page URL")):
+    """Number of in-links and out-links of a URL"""
+    degree = await asyncio.to_thread(link_graph.degree, url)
+    if degree is None:
+        raise HTTPException(status_code=404, detail="URL is not in the link graph")
+    return degree
+
+@router.get("/links/broken", dependencies=[Depends(link_graph_enabled)])
+async def get_broken_links(
+    url: Optional[str] = Query(None, description="Only links found on this page"),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Links whose target failed to fetch (HTTP error, timeout or connection failure)
+    
+    Without url, lists every failed URL with the number of pages linking to it.
+    """
+    broken = await asyncio.to_thread(link_graph.broken_links, url, limit)
+    if broken is None:
+        raise HTTPException(status_code=404, detail="URL is not in the link graph")
+    return {"url": url, "broken": broken}
+
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Allow the request only with the configured admin token"""
+    if not settings.admin_token:
+        raise HTTPException(status_code=404, detail="Not found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, settings.admin_token):
+        raise HTTPException(status_code=403, detail="Invalid admin token")
+
+@router.get("/admin/profile", dependencies=[Depends(require_admin)])
+async def profile_process(
+    seconds: Optional[float] = Query(None, gt=0, description="Profile for this many seconds"),
+    requests: Optional[int] = Query(None, gt=0, description="Profile until this many /api/scrape requests finish"),
+    interval_ms: Optional[float] = Query(None, ge=1, le=100, description="Sampling interval"),
+    format: ProfileFormat = ProfileFormat.COLLAPSED
+):
+    """
+    Sample the running process and return aggregated stacks (admin only)
+    
+    Samples are tagged by stage (fetch, parse, extract_*, serialization,
+    save). The collapsed format feeds straight into flamegraph.pl or
+    speedscope; json adds per-stage sample counts and wall time.
+    Requires the X-Admin-Token header.
+    """
+    if seconds is None and requests is None:
+        seconds = 10
+    
+    try:
+        report = await profiler.profile(
+            seconds=seconds,
+            requests=requests,
+            interval=interval_ms / 1000 if interval_ms else None
+        )
+    except ProfilerBusyError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    
+    logger.info(f"Profile finished: {report['samples']} samples over {report['duration_seconds']}s")
+    
+    if format == ProfileFormat.COLLAPSED:
+        return PlainTextResponse("\n".join(report["collapsed"]) + "\n")
+    
+    report["top_stacks"] = report.pop("collapsed")[:50]
+    return report
@@ -0,0 +1,293 @@
+# ===========================
+# app/cli/bulk_parse.py
+# ===========================
+"""
+Offline bulk extraction over HTML we already have.
+
+Runs the normal HTMLParser extraction over a directory of HTML files, a
+tarball or a WARC file, with no network I/O. Pages are spread over a
+process pool in chunks and results are streamed to an NDJSON file or to
+the result store as they complete; stored pages also update the link
+graph when links are extracted. Finished record ids are appended to a
+checkpoint file, so an interrupted run picks up where it left off.
+
+Replay mode (--archive) runs the same extraction over every response saved
+by the WARC archive, so results can be re-derived without refetching.
+
+Usage:
+    python -m app.cli.bulk_parse SOURCE [SOURCE ...] --output results.ndjson
+    python -m app.cli.bulk_parse crawl.warc.gz --store --options text,links
+    python -m app.cli.bulk_parse --archive --output replayed.ndjson
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tarfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from app.core.archive import response_archive
+from app.core.config import settings
+from app.core.link_graph import link_graph
+from app.core.scraper import WebScraper
+from app.models.schemas import ScrapingOption, ScrapeResponse, ScrapedData
+from app.utils.warc import decode_html, decode_payload, iter_warc_records
+
+logger = logging.getLogger(__name__)
+
+HTML_SUFFIXES = ('.html', '.htm', '.xhtml')
+
+# (record_id, url, path, body, headers); directory pages are read by the
+# worker from path, archive pages carry their body. WARC bodies are passed as
+# recorded along with their HTTP headers, and the worker decodes them. Record
+# ids include the resolved source path, so checkpoints never confuse pages of
+# two sources that share a relative path
+WorkItem = Tuple[str, str, Optional[str], Optional[bytes], Optional[Dict[str, str]]]
+
+def iter_directory(root: Path, base_url: Optional[str]) -> Iterator[WorkItem]:
+    for path in sorted(root.rglob('*')):
+        if path.suffix.lower() in HTML_SUFFIXES and path.is_file():
+            relative = path.relative_to(root).as_posix()
+            url = base_url.rstrip('/') + '/' + relative if base_url else path.resolve().as_uri()
+            yield path.resolve().as_posix(), url, str(path), None, None
+
+def iter_tarball(source: Path, base_url: Optional[str]) -> Iterator[WorkItem]:
+    with tarfile.open(source, 'r:*') as tar:
+        for member in tar:
+            if not member.isfile() or not member.name.lower().endswith(HTML_SUFFIXES):
+                continue
+            body = tar.extractfile(member).read()
+            record_id = f"{source.resolve().as_posix()}!/{member.name}"
+            url = base_url.rstrip('/') + '/' + member.name if base_url else f"file://{source.resolve()}!/{member.name}"
+            yield record_id, url, None, body, None
+
+def iter_warc(source: Path) -> Iterator[WorkItem]:
+    for record in iter_warc_records(str(source)):
+        if record.type != 'response':
+            continue
+        status, headers, body = record.http_response()
+        content_type = headers.get('content-type', '')
+        if not 200 <= status < 300 or 'html' not in content_type.lower():
+            continue
+        record_id = record.record_id or f"{source.resolve().as_posix()}@{record.offset}"
+        yield record_id, record.target_uri, None, body, headers
+
+def iter_source(source: Path, base_url: Optional[str] = None) -> Iterator[WorkItem]:
+    """Yield work items from a directory, tarball or WARC file"""
+    if source.is_dir():
+        return iter_directory(source, base_url)
+    if source.name.endswith(('.warc', '.warc.gz')):
+        return iter_warc(source)
+    if tarfile.is_tarfile(source):
+        return iter_tarball(source, base_url)
+    raise ValueError(f"Unsupported source: {source} (expected a directory, tarball or WARC file)")
+
+# Per-process worker state, set up once by the pool initializer
+_worker = {}
+
+def _init_worker(options: List[ScrapingOption], indent: Optional[int]):
+    _worker['scraper'] = WebScraper()
+    _worker['loop'] = asyncio.new_event_loop()
+    _worker['options'] = options
+    _worker['indent'] = indent
+
+def _parse_item(item: WorkItem) -> Tuple[str, int, bool, str]:
+    """Extract one page; returns (record_id, bytes read, success, serialized result)"""
+    record_id, url, path, body, headers = item
+    options = _worker['options']
+
+    try:
+        if path is not None:
+            body = Path(path).read_bytes()
+        if headers is not None:
+            body = decode_payload(headers, body)
+        html = decode_html(body, headers and headers.get('content-type'))
+        result = _worker['loop'].run_until_complete(_worker['scraper'].parse_html(html, url, options))
+    except Exception as e:
+        result = ScrapeResponse(
+            url=url,
+            timestamp=datetime.utcnow(),
+            options_used=options,
+            success=False,
+            error=f"Parse error: {str(e)}",
+            data=ScrapedData(),
+            stats={}
+        )
+
+    data = result.dict()
+    data['record_id'] = record_id
+    text = json.dumps(data, indent=_worker['indent'], ensure_ascii=False, default=str)
+    return record_id, len(body or b''), result.success, text
+
+def load_checkpoint(path: Path) -> Set[str]:
+    if not path.exists():
+        return set()
+    with open(path, 'r', encoding='utf-8') as f:
+        return {line.rstrip('\n') for line in f if line.strip()}
+
+class ProgressReporter:
+    """Periodically reports pages processed and throughput to stderr"""
+
+    def __init__(self, interval: float = 2.0, stream=sys.stderr):
+        self.interval = interval
+        self.stream = stream
+        self.start = time.perf_counter()
+        self.last_report = self.start
+        self.processed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.bytes = 0
+
+    def update(self, size: int, success: bool):
+        self.processed += 1
+        self.bytes += size
+        if not success:
+            self.failed += 1
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.interval:
+            self.last_report = now
+            self.report()
+
+    def report(self, final: bool = False):
+        elapsed = max(time.perf_counter() - self.start, 1e-9)
+        label = "done" if final else "progress"
+        print(
+            f"[{label}] {self.processed} pages ({self.failed} failed, {self.skipped} skipped) "
+            f"in {elapsed:.1f}s | {self.processed / elapsed:,.1f} pages/s | {self.bytes / elapsed / 1e6:,.2f} MB/s",
+            file=self.stream
+        )
+
+def run(sources: List[Path], options: List[ScrapingOption], output: Optional[Path] = None, store: bool = False,
+        workers: int = None, chunksize: int = 16, base_url: Optional[str] = None,
+        checkpoint: Optional[Path] = None, resume: bool = True,
+        progress_interval: float = 2.0) -> ProgressReporter:
+    """Extract every page in sources, writing results to output or the result store"""
+    if store:
+        store_dir = Path(settings.scraped_dir)
+        store_dir.mkdir(parents=True, exist_ok=True)
+        checkpoint = checkpoint or store_dir / 'bulk_parse.checkpoint'
+    else:
+        checkpoint = checkpoint or output.with_name(output.name + '.checkpoint')
+
+    if not resume:
+        for path in (checkpoint, output):
+            if path is not None and path.exists():
+                path.unlink()
+
+    # Validate every source before any worker starts
+    iterators = [iter_source(source, base_url) for source in sources]
+    items = (item for iterator in iterators for item in iterator)
+    done = load_checkpoint(checkpoint)
+    progress = ProgressReporter(progress_interval)
+
+    def pending() -> Iterator[WorkItem]:
+        for item in items:
+            if item[0] in done:
+                progress.skipped += 1
+                continue
+            yield item
+
+    index_links = store and settings.link_graph_enabled and ScrapingOption.LINKS in options
+    compaction_due = False
+
+    out = None if store else open(output, 'a', encoding='utf-8')
+    try:
+        with open(checkpoint, 'a', encoding='utf-8') as ckpt, multiprocessing.Pool(
+            workers or os.cpu_count(),
+            initializer=_init_worker,
+            initargs=(options, 2 if store else None)
+        ) as pool:
+            for record_id, size, success, text in pool.imap_unordered(_parse_item, pending(), chunksize):
+                if store:
+                    digest = hashlib.sha1(record_id.encode('utf-8')).hexdigest()[:16]
+                    (store_dir / f"bulk_{digest}.json").write_text(text, encoding='utf-8')
+                    if index_links and success:
+                        data = json.loads(text)
+                        links = [link['absolute_url'] for link in data['data']['links'] or []]
+                        compaction_due = link_graph.add_page(data['url'], links) or compaction_due
+                else:
+                    out.write(text + '\n')
+                    out.flush()
+
+                # Only checkpoint once the result is durable in the output
+                ckpt.write(record_id + '\n')
+                ckpt.flush()
+                progress.update(size, success)
+    finally:
+        if out is not None:
+            out.close()
+
+    if compaction_due:
+        link_graph.compact()
+
+    progress.report(final=True)
+    return progress
+
+def parse_options(value: str) -> List[ScrapingOption]:
+    try:
+        return [ScrapingOption(option.strip()) for option in value.split(',') if option.strip()]
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+def main(argv: List[str] = None):
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m app.cli.bulk_parse',
+        description="Run HTML extraction over local pages using all cores"
+    )
+    arg_parser.add_argument('sources', type=Path, nargs='*', metavar='SOURCE',
+                            help="directory of HTML files, tarball or WARC file")
+    arg_parser.add_argument('--archive', action='store_true',
+                            help="replay every response in the WARC archive (ARCHIVE_DIR)")
+    target = arg_parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--output', '-o', type=Path, help="NDJSON file to append results to")
+    target.add_argument('--store', action='store_true', help="save results to the result store")
+    arg_parser.add_argument('--options', type=parse_options, default=list(ScrapingOption),
+                            help="comma-separated options to extract (default: all)")
+    arg_parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(), help="worker processes")
+    arg_parser.add_argument('--chunksize', type=int, default=16, help="pages handed to a worker at a time")
+    arg_parser.add_argument('--base-url', help="URL prefix for directory and tarball pages (default: file URIs)")
+    arg_parser.add_argument('--checkpoint', type=Path, help="checkpoint file (default: next to the output)")
+    arg_parser.add_argument('--no-resume', dest='resume', action='store_false',
+                            help="discard any previous checkpoint and output and start over")
+    arg_parser.add_argument('--progress-interval', type=float, default=2.0, help="seconds between progress lines")
+    args = arg_parser.parse_args(argv)
+
+    sources = list(args.sources)
+    if args.archive:
+        sources.extend(response_archive.warc_files())
+    if not sources:
+        arg_parser.error("no sources given (pass SOURCE paths or --archive)")
+    for source in sources:
+        if not source.exists():
+            arg_parser.error(f"{source} does not exist")
+
+    try:
+        run(
+            sources,
+            args.options,
+            output=args.output,
+            store=args.store,
+            workers=args.workers,
+            chunksize=args.chunksize,
+            base_url=args.base_url,
+            checkpoint=args.checkpoint,
+            resume=args.resume,
+            progress_interval=args.progress_interval
+        )
+    except ValueError as e:
+        arg_parser.error(str(e))
+    except KeyboardInterrupt:
+        print("Interrupted; rerun the same command to resume", file=sys.stderr)
+        return 130
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# ===========================
+# app/cli/compact_links.py
+# ===========================
+"""
+Fold pages saved since the last compaction into new link graph segments.
+
+API workers start this in a separate process when compaction is due, so
+the CPU-bound rebuild never runs inside a process serving requests. It can
+also be run by hand or from cron; if another process is already
+compacting, it exits without doing anything.
+
+Usage:
+    python -m app.cli.compact_links [--dir LINK_GRAPH_DIR]
+"""
+import argparse
+import logging
+import sys
+import time
+from typing import List
+
+from app.core.config import settings
+from app.core.link_graph import LinkGraph
+
+def main(argv: List[str] = None) -> int:
+    arg_parser = argparse.ArgumentParser(
+        prog='python -m app.cli.compact_links',
+        description="Compact the link graph"
+    )
+    arg_parser.add_argument('--dir', default=settings.link_graph_dir, help="link graph directory (default: LINK_GRAPH_DIR)")
+    args = arg_parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
+
+    graph = LinkGraph(args.dir)
+    started = time.perf_counter()
+    try:
+        compacted = graph.compact()
+    finally:
+        graph.close()
+
+    status = "compacted" if compacted else "nothing to do"
+    print(f"{status} in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,294 @@
+# ===========================
+# app/core/admission.py
+# ===========================
+import asyncio
+import heapq
+import itertools
+import logging
+import math
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from app.core.config import settings
+from app.core.exceptions import ServiceOverloadedException, TooManyRequestsException
+
+logger = logging.getLogger(__name__)
+
+# Slot held by the scrape running in the current task, if any
+_current_slot: ContextVar[Optional["AdmissionSlot"]] = ContextVar("admission_slot", default=None)
+
+def record_response_bytes(size: int):
+    """Charge a fetched response body against the current admission slot"""
+    slot = _current_slot.get()
+    if slot is not None:
+        slot.add_bytes(size)
+
+async def sleep_outside_slot(seconds: float):
+    """Sleep without holding the current scrape's admission slot
+
+    For deliberate waits such as a per-host rate limit: other requests can
+    use the capacity meanwhile, and the scrape then queues ahead of new
+    requests to get it back. The time is left out of the latency that
+    steers the concurrency limit.
+    """
+    slot = _current_slot.get()
+    if slot is None:
+        await asyncio.sleep(seconds)
+        return
+
+    started = time.monotonic()
+    slot.controller._suspend(slot)
+    await asyncio.sleep(seconds)
+    await slot.controller._resume(slot)
+    slot.waited += time.monotonic() - started
+
+class AdmissionSlot:
+    """A granted scrape slot; releasing it frees capacity for queued requests"""
+
+    def __init__(self, controller: "AdmissionController", client_id: str):
+        self.controller = controller
+        self.client_id = client_id
+        self.admitted_at = time.monotonic()
+        self.bytes = 0
+        self.waited = 0.0
+        self.suspended = False
+        self.released = False
+        self._token = None
+
+    def add_bytes(self, size: int):
+        self.bytes += size
+        self.controller.inflight_bytes += size
+
+    def activate(self):
+        """Make this slot the target of record_response_bytes in the current context"""
+        self._token = _current_slot.set(self)
+
+    def release(self):
+        if self.released:
+            return
+        self.released = True
+
+        if self._token is not None:
+            try:
+                _current_slot.reset(self._token)
+            except ValueError:
+                # Released from a different context than the one that activated it
+                pass
+
+        self.controller._release(self)
+
+class AdmissionController:
+    """
+    Caps concurrent scrapes and in-flight response bytes
+
+    Requests over the limit wait in a bounded queue ordered by how much of
+    the capacity their client already holds, so a single busy client cannot
+    starve the others. When the queue is full, a client exceeds its share,
+    or a waiter times out, the request is shed with a Retry-After hint.
+    The concurrency limit adapts to observed latency (AIMD): it backs off
+    when the latency average exceeds the target and creeps back up when
+    scrapes complete under it.
+    """
+
+    def __init__(
+        self,
+        max_concurrent: int = settings.max_concurrent_scrapes,
+        min_concurrent: int = settings.min_concurrent_scrapes,
+        max_queue: int = settings.max_queued_scrapes,
+        max_per_client: int = settings.max_scrapes_per_client,
+        max_inflight_bytes: int = settings.max_inflight_bytes,
+        queue_timeout: float = settings.admission_queue_timeout,
+        target_latency: float = settings.target_scrape_latency
+    ):
+        self.max_concurrent = max_concurrent
+        self.min_concurrent = min(min_concurrent, max_concurrent)
+        self.max_queue = max_queue
+        self.max_per_client = max_per_client
+        self.max_inflight_bytes = max_inflight_bytes
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+
+        self.limit = float(max_concurrent)
+        self.active = 0
+        self.inflight_bytes = 0
+        self.latency_avg = 0.0
+        self.admitted = 0
+        self.shed = {"queue_full": 0, "client_limit": 0, "queue_timeout": 0}
+
+        self._client_load: Dict[str, int] = {}
+        self._waiters: List[Any] = []
+        self._queued = 0
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+
+    def slot(self, client_id: str) -> "_SlotRequest":
+        """Return an async context manager that waits for and holds a slot"""
+        return _SlotRequest(self, client_id)
+
+    async def acquire(self, client_id: str) -> AdmissionSlot:
+        """Wait for a slot, raising an overload exception if the request is shed"""
+        load = self._client_load.get(client_id, 0)
+        if load >= self.max_per_client:
+            self.shed["client_limit"] += 1
+            raise TooManyRequestsException(
+                f"Too many concurrent scrapes for this client (limit {self.max_per_client})",
+                retry_after=self.retry_after()
+            )
+
+        if self._has_capacity() and not self._queued:
+            return self._grant(client_id)
+
+        if self._queued >= self.max_queue:
+            self.shed["queue_full"] += 1
+            raise ServiceOverloadedException(
+                "Scraper is at capacity, please retry later",
+                retry_after=self.retry_after()
+            )
+
+        # Clients already holding capacity queue behind lighter ones
+        future = asyncio.get_running_loop().create_future()
+        entry = [load, next(self._sequence), future, client_id, None]
+        heapq.heappush(self._waiters, entry)
+        self._queued += 1
+        self._client_load[client_id] = load + 1
+
+        try:
+            await asyncio.wait({future}, timeout=self.queue_timeout)
+        except BaseException:
+            # The request went away while queued; hand back anything it was granted
+            if future.done():
+                future.result().release()
+            else:
+                self._abandon(future, client_id)
+            raise
+
+        if not future.done():
+            self._abandon(future, client_id)
+            self.shed["queue_timeout"] += 1
+            raise ServiceOverloadedException(
+                "Timed out waiting for a scrape slot",
+                retry_after=self.retry_after()
+            )
+
+        return future.result()
+
+    def retry_after(self) -> int:
+        """Seconds a shed client should wait, based on the queue and recent latency"""
+        latency = self.latency_avg or self.target_latency
+        return max(1, math.ceil(latency * (self._queued + 1) / max(1, int(self.limit))))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "queue_depth": self._queued,
+            "concurrency_limit": int(self.limit),
+            "inflight_bytes": self.inflight_bytes,
+            "latency_avg_seconds": round(self.latency_avg, 3),
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values())
+        }
+
+    def _has_capacity(self) -> bool:
+        return self.active < int(self.limit) and self.inflight_bytes < self.max_inflight_bytes
+
+    def _grant(self, client_id: str, queued: bool = False) -> AdmissionSlot:
+        self.active += 1
+        self.admitted += 1
+        if not queued:
+            self._client_load[client_id] = self._client_load.get(client_id, 0) + 1
+        return AdmissionSlot(self, client_id)
+
+    def _release(self, slot: AdmissionSlot):
+        if not slot.suspended:
+            self.active -= 1
+        self.inflight_bytes -= slot.bytes
+        self._drop_client_load(slot.client_id)
+        self._observe_latency(max(0.0, time.monotonic() - slot.admitted_at - slot.waited))
+        self._wake_waiters()
+
+    def _suspend(self, slot: AdmissionSlot):
+        """Lend a slot's capacity out while its scrape waits"""
+        slot.suspended = True
+        self.active -= 1
+        self._wake_waiters()
+
+    async def _resume(self, slot: AdmissionSlot):
+        """Take capacity back for a suspended slot, waiting if it was given away"""
+        if self._has_capacity() and not self._queued:
+            self.active += 1
+            slot.suspended = False
+            return
+
+        # Scrapes that were already admitted go ahead of new requests, and
+        # are never shed
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, [-1, next(self._sequence), future, slot.client_id, slot])
+        self._queued += 1
+        try:
+            await future
+        except BaseException:
+            if not future.done():
+                future.cancel()
+                self._queued -= 1
+            raise
+
+    def _abandon(self, future: asyncio.Future, client_id: str):
+        """Withdraw a waiter from the queue; its heap entry is skipped when popped"""
+        future.cancel()
+        self._queued -= 1
+        self._drop_client_load(client_id)
+
+    def _drop_client_load(self, client_id: str):
+        load = self._client_load.get(client_id, 0) - 1
+        if load > 0:
+            self._client_load[client_id] = load
+        else:
+            self._client_load.pop(client_id, None)
+
+    def _observe_latency(self, latency: float):
+        now = time.monotonic()
+        self.latency_avg = latency if not self.latency_avg else 0.8 * self.latency_avg + 0.2 * latency
+
+        if self.latency_avg > self.target_latency:
+            # Back off at most once per average scrape duration
+            if now - self._last_decrease >= self.latency_avg:
+                self.limit = max(float(self.min_concurrent), self.limit * 0.75)
+                self._last_decrease = now
+                logger.warning(f"Scrape latency {self.latency_avg:.2f}s over target, limit now {int(self.limit)}")
+        else:
+            self.limit = min(float(self.max_concurrent), self.limit + 1 / self.limit)
+
+    def _wake_waiters(self):
+        while self._waiters and self._has_capacity():
+            _, _, future, client_id, suspended = heapq.heappop(self._waiters)
+            if future.done():
+                continue
+
+            self._queued -= 1
+            if suspended is None:
+                future.set_result(self._grant(client_id, queued=True))
+            else:
+                self.active += 1
+                suspended.suspended = False
+                future.set_result(suspended)
+
+class _SlotRequest:
+    """Async context manager returned by AdmissionController.slot"""
+
+    def __init__(self, controller: AdmissionController, client_id: str):
+        self.controller = controller
+        self.client_id = client_id
+        self.slot = None
+
+    async def __aenter__(self) -> AdmissionSlot:
+        self.slot = await self.controller.acquire(self.client_id)
+        self.slot.activate()
+        return self.slot
+
+    async def __aexit__(self, exc_type, exc, tb):
+        self.slot.release()
+
+# Shared controller guarding /api/scrape
+admission_controller = AdmissionController()
@@ -0,0 +1,174 @@
+# ===========================
+# app/core/archive.py
+# ===========================
+import asyncio
+import logging
+import os
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import httpx
+
+from app.core.config import settings
+from app.core.shared_state import SQLiteStore
+from app.utils.warc import WarcWriter, read_warc_record
+
+logger = logging.getLogger(__name__)
+
+# Hop-by-hop and encoding headers that no longer describe the decoded body we store
+_DROPPED_HEADERS = {'content-encoding', 'content-length', 'transfer-encoding', 'connection'}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    url TEXT PRIMARY KEY,
+    timestamp TEXT NOT NULL,
+    filename TEXT NOT NULL,
+    offset INTEGER NOT NULL,
+    length INTEGER NOT NULL
+);
+"""
+
+class IndexEntry:
+    """Location of an archived response"""
+    __slots__ = ('url', 'timestamp', 'filename', 'offset', 'length')
+
+    def __init__(self, url: str, timestamp: str, filename: str, offset: int, length: int):
+        self.url = url
+        self.timestamp = timestamp
+        self.filename = filename
+        self.offset = offset
+        self.length = length
+
+class ResponseArchive(SQLiteStore):
+    """
+    Appends raw HTTP responses to rotating, compressed WARC files
+
+    The latest record for each URL is kept in an SQLite index
+    (url, timestamp, file, offset, length) shared by every worker, so a
+    single response can be found with one primary-key lookup and read
+    back with one seek. Files are named per process, which keeps
+    concurrent workers from interleaving writes.
+    """
+
+    SCHEMA = _SCHEMA
+    INDEX_NAME = 'index.db'
+    # Index of archives written before it moved to SQLite; imported once
+    LEGACY_INDEX_NAME = 'index.tsv'
+
+    def __init__(self, directory: str = settings.archive_dir, max_file_bytes: int = settings.archive_max_file_bytes):
+        self.directory = Path(directory)
+        super().__init__(str(self.directory / self.INDEX_NAME))
+        self.max_file_bytes = max_file_bytes
+
+        self._write_lock = threading.Lock()
+        self._writer: Optional[WarcWriter] = None
+        self._file_bytes = 0
+        self._sequence = 0
+        self._legacy_checked = False
+
+    async def record(self, url: str, response: httpx.Response):
+        """Archive a response fetched for url without blocking the event loop
+        
+        The record is keyed by the requested URL, so replays find it even
+        when the fetch followed redirects.
+        """
+        headers = {
+            name: value for name, value in response.headers.items()
+            if name.lower() not in _DROPPED_HEADERS
+        }
+        headers['Content-Length'] = str(len(response.content))
+
+        await asyncio.to_thread(
+            self.write,
+            url,
+            response.status_code,
+            response.reason_phrase,
+            headers,
+            response.content
+        )
+
+    def write(self, url: str, status: int, reason: str, headers: Dict[str, str], body: bytes) -> IndexEntry:
+        with self._write_lock:
+            writer = self._current_writer()
+            offset, length = writer.write_response(url, status, reason, headers, body)
+            self._file_bytes = offset + length
+
+        entry = IndexEntry(url, datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+                           os.path.basename(writer.path), offset, length)
+        self._import_legacy_index()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT OR REPLACE INTO responses (url, timestamp, filename, offset, length) VALUES (?, ?, ?, ?, ?)",
+                (entry.url, entry.timestamp, entry.filename, entry.offset, entry.length)
+            )
+
+        return entry
+
+    def lookup(self, url: str) -> Optional[IndexEntry]:
+        """Return the most recent index entry for url"""
+        self._import_legacy_index()
+        row = self._connection().execute(
+            "SELECT url, timestamp, filename, offset, length FROM responses WHERE url = ?", (url,)
+        ).fetchone()
+        return IndexEntry(*row) if row else None
+
+    def load(self, url: str) -> Optional[Tuple[int, Dict[str, str], bytes]]:
+        """Return the (status, headers, body) most recently archived for url"""
+        entry = self.lookup(url)
+        if entry is None:
+            return None
+
+        record = read_warc_record(str(self.directory / entry.filename), entry.offset)
+        return record.http_response()
+
+    def warc_files(self) -> List[Path]:
+        """Archive files, oldest first"""
+        return sorted(self.directory.glob('*.warc.gz'))
+
+    def _current_writer(self) -> WarcWriter:
+        if self._writer is None or self._file_bytes >= self.max_file_bytes:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            self._sequence += 1
+            timestamp = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+            path = self.directory / f"responses-{timestamp}-{os.getpid()}-{self._sequence:05d}.warc.gz"
+
+            self._writer = WarcWriter(str(path))
+            offset, length = self._writer.write_record(
+                'warcinfo',
+                f"software: {settings.app_name}\r\nformat: WARC File Format 1.0\r\n".encode('utf-8'),
+                {'Content-Type': 'application/warc-fields'}
+            )
+            self._file_bytes = offset + length
+            logger.info(f"Archiving responses to {path}")
+
+        return self._writer
+
+    def _import_legacy_index(self):
+        """Move the entries of a tab-separated index.tsv into the SQLite index, once"""
+        if self._legacy_checked:
+            return
+        self._legacy_checked = True
+
+        legacy_path = self.directory / self.LEGACY_INDEX_NAME
+        if not legacy_path.exists():
+            return
+
+        with self._transaction() as db:
+            # Another worker may have imported it while we waited for the lock
+            if not legacy_path.exists():
+                return
+            with open(legacy_path, 'r', encoding='utf-8') as f:
+                fields = (line.rstrip('\n').split('\t') for line in f if line.endswith('\n'))
+                # A partially written last line has no newline or too few fields
+                rows = [row for row in fields if len(row) == 5]
+            # Later lines are newer, and INSERT OR REPLACE keeps the last one
+            db.executemany(
+                "INSERT OR REPLACE INTO responses (url, timestamp, filename, offset, length) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            legacy_path.rename(legacy_path.with_name(legacy_path.name + '.imported'))
+        logger.info(f"Imported {len(rows)} entries from {legacy_path} into the archive index")
+
+response_archive = ResponseArchive()
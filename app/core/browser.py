@@ -0,0 +1,243 @@
+# ===========================
+# app/core/browser.py
+# ===========================
+import asyncio
+import logging
+from abc import ABC, abstractmethod
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Deque, Dict, Optional, Set
+
+from app.core.config import settings
+from app.core.exceptions import ScrapingException, TimeoutException
+
+logger = logging.getLogger(__name__)
+
+# document.readyState to wait for, keyed by the wait_until option
+READY_STATES = {
+    'domcontentloaded': ('interactive', 'complete'),
+    'load': ('complete',)
+}
+
+class BrowserSession(ABC):
+    """
+    A started browser that renders one page at a time
+
+    Subclasses wrap a real driver; tests can substitute a local stand-in.
+    All methods are blocking and are called from worker threads.
+    """
+
+    def __init__(self):
+        self.pages_served = 0
+
+    @abstractmethod
+    def render(self, url: str, wait_until: str = 'load', wait_for_selector: Optional[str] = None,
+               timeout: float = settings.browser_page_timeout) -> str:
+        """Load url, wait for the readiness conditions and return the rendered DOM"""
+
+    def is_healthy(self) -> bool:
+        return True
+
+    def close(self):
+        pass
+
+class SeleniumSession(BrowserSession):
+    """Headless Chrome session that skips images, fonts and media"""
+
+    def __init__(self, page_timeout: float = settings.browser_page_timeout):
+        super().__init__()
+        try:
+            from selenium import webdriver
+        except ImportError:
+            raise ScrapingException("JavaScript rendering requires selenium to be installed", 501)
+
+        options = webdriver.ChromeOptions()
+        options.add_argument('--headless=new')
+        options.add_argument('--disable-gpu')
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        options.add_argument('--blink-settings=imagesEnabled=false')
+        options.add_argument(f'--user-agent={settings.user_agent}')
+        options.add_experimental_option('prefs', {'profile.managed_default_content_settings.images': 2})
+        # Return control once the DOM is ready; readiness waits happen in render()
+        options.page_load_strategy = 'eager'
+
+        self.driver = webdriver.Chrome(options=options)
+        self.driver.set_page_load_timeout(page_timeout)
+        self.driver.execute_cdp_cmd('Network.enable', {})
+        self.driver.execute_cdp_cmd('Network.setBlockedURLs', {'urls': settings.browser_blocked_resources})
+
+    def render(self, url: str, wait_until: str = 'load', wait_for_selector: Optional[str] = None,
+               timeout: float = settings.browser_page_timeout) -> str:
+        from selenium.common.exceptions import TimeoutException as SeleniumTimeout
+        from selenium.webdriver.common.by import By
+        from selenium.webdriver.support import expected_conditions
+        from selenium.webdriver.support.ui import WebDriverWait
+
+        ready_states = READY_STATES.get(wait_until, READY_STATES['load'])
+
+        try:
+            # Pages must not see state left behind by the previous lease
+            self.driver.delete_all_cookies()
+            self.driver.get(url)
+
+            wait = WebDriverWait(self.driver, timeout)
+            wait.until(lambda driver: driver.execute_script('return document.readyState') in ready_states)
+            if wait_for_selector:
+                wait.until(expected_conditions.presence_of_element_located((By.CSS_SELECTOR, wait_for_selector)))
+
+            return self.driver.page_source
+        except SeleniumTimeout:
+            raise TimeoutException(f"Page did not become ready within {timeout} seconds")
+
+    def is_healthy(self) -> bool:
+        try:
+            return self.driver.execute_script('return 1') == 1
+        except Exception:
+            return False
+
+    def close(self):
+        try:
+            self.driver.quit()
+        except Exception as e:
+            logger.warning(f"Error closing browser session: {e}")
+
+class BrowserPool:
+    """
+    Bounded pool of pre-started browser sessions
+
+    Sessions are leased one request at a time, health-checked before use
+    and recycled after max_pages renders. A session whose render failed or
+    was cancelled is never leased again. Recycled and failed sessions are
+    replaced in the background, so the pool stays warm.
+    """
+
+    def __init__(
+        self,
+        size: int = settings.browser_pool_size,
+        max_pages: int = settings.browser_max_pages,
+        session_factory: Callable[[], BrowserSession] = SeleniumSession
+    ):
+        self.size = size
+        self.max_pages = max_pages
+        self.session_factory = session_factory
+
+        self._idle: Deque[BrowserSession] = deque()
+        self._slots = asyncio.Semaphore(size)
+        self._background: Set[asyncio.Task] = set()
+        self.leased = 0
+        self.created = 0
+        self.recycled = 0
+        self.unhealthy = 0
+        self.failed = 0
+
+    async def start(self):
+        """Start sessions up front so the first renders skip browser launch"""
+        missing = self.size - len(self._idle)
+        sessions = await asyncio.gather(
+            *(self._create_session() for _ in range(missing)),
+            return_exceptions=True
+        )
+        for session in sessions:
+            if isinstance(session, BaseException):
+                logger.error(f"Failed to start browser session: {session}")
+            else:
+                self._idle.append(session)
+        logger.info(f"Browser pool warmed with {len(self._idle)} sessions")
+
+    async def close(self):
+        for task in list(self._background):
+            task.cancel()
+        while self._idle:
+            await asyncio.to_thread(self._idle.pop().close)
+
+    @asynccontextmanager
+    async def lease(self):
+        """Lease a healthy session for the duration of the block"""
+        async with self._slots:
+            session = await self._checkout()
+            self.leased += 1
+            try:
+                yield session
+            except BaseException:
+                # A cancelled render keeps driving the session in its worker
+                # thread, so it is closed and replaced rather than re-pooled
+                self.leased -= 1
+                self.failed += 1
+                self._retire(session)
+                raise
+            else:
+                self.leased -= 1
+                session.pages_served += 1
+                if session.pages_served >= self.max_pages:
+                    self.recycled += 1
+                    await self._discard(session)
+                    self._replenish()
+                else:
+                    self._idle.append(session)
+
+    async def render(self, url: str, wait_until: str = 'load', wait_for_selector: Optional[str] = None,
+                     timeout: float = settings.browser_page_timeout) -> str:
+        """Render url in a pooled session and return the final DOM"""
+        async with self.lease() as session:
+            return await asyncio.to_thread(session.render, url, wait_until, wait_for_selector, timeout)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": self.size,
+            "idle": len(self._idle),
+            "leased": self.leased,
+            "created": self.created,
+            "recycled": self.recycled,
+            "unhealthy": self.unhealthy,
+            "failed": self.failed
+        }
+
+    async def _checkout(self) -> BrowserSession:
+        while self._idle:
+            session = self._idle.popleft()
+            if await asyncio.to_thread(session.is_healthy):
+                return session
+            self.unhealthy += 1
+            await self._discard(session)
+        return await self._create_session()
+
+    async def _create_session(self) -> BrowserSession:
+        session = await asyncio.to_thread(self.session_factory)
+        self.created += 1
+        return session
+
+    async def _discard(self, session: BrowserSession):
+        await asyncio.to_thread(session.close)
+
+    def _retire(self, session: BrowserSession):
+        """Close session and start a replacement, both without waiting"""
+        async def close():
+            try:
+                await self._discard(session)
+            except Exception as e:
+                logger.warning(f"Error closing browser session: {e}")
+
+        self._track(asyncio.create_task(close()))
+        self._replenish()
+
+    def _replenish(self):
+        async def replace():
+            try:
+                session = await self._create_session()
+            except Exception as e:
+                logger.error(f"Failed to replace browser session: {e}")
+                return
+            if len(self._idle) + self.leased < self.size:
+                self._idle.append(session)
+            else:
+                await self._discard(session)
+
+        self._track(asyncio.create_task(replace()))
+
+    def _track(self, task: asyncio.Task):
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+# Shared pool used for render_js scrapes
+browser_pool = BrowserPool()
@@ -14,25 +14,89 @@ class Settings(BaseSettings):
     # Server settings
     host: str = "0.0.0.0"
     port: int = 8000
+    # Import the parser, build the HTTP client pieces and compile templates
+    # in the background at startup instead of during the first requests
+    warm_up_on_startup: bool = True
     
     # Scraping settings
     request_timeout: int = 30
     max_retries: int = 3
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
     
-    # Rate limiting
+    # DNS cache
+    dns_cache_enabled: bool = True
+    dns_cache_size: int = 10000
+    dns_cache_ttl: float = 300.0
+    dns_min_ttl: float = 30.0
+    dns_max_ttl: float = 3600.0
+    dns_negative_ttl: float = 30.0
+    dns_ttl_query_timeout: float = 2.0
+    
+    # JavaScript rendering (headless browser pool)
+    js_render_enabled: bool = False
+    browser_pool_size: int = 2
+    browser_max_pages: int = 50
+    browser_page_timeout: int = 30
+    browser_blocked_resources: List[str] = [
+        "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico",
+        "*.woff", "*.woff2", "*.ttf", "*.otf",
+        "*.mp4", "*.webm", "*.mp3", "*.ogg", "*.wav"
+    ]
+    
+    # Rate limiting (requests per minute to any one host, across all workers; 0 disables)
     rate_limit_per_minute: int = 60
+    rate_limit_max_wait: float = 30.0
+    
+    # Admission control
+    max_concurrent_scrapes: int = 8
+    min_concurrent_scrapes: int = 1
+    max_queued_scrapes: int = 32
+    max_scrapes_per_client: int = 4
+    max_inflight_bytes: int = 64 * 1024 * 1024
+    admission_queue_timeout: float = 10.0
+    target_scrape_latency: float = 5.0
     
     # Security
     max_url_length: int = 2048
     allowed_schemes: List[str] = ["http", "https"]
     
+    # Admin / diagnostics (admin endpoints are disabled while admin_token is empty)
+    admin_token: str = ""
+    profiler_interval_ms: float = 5.0
+    profiler_max_seconds: float = 60.0
+    profiler_max_depth: int = 64
+    
     # File storage
     data_dir: str = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data")
     scraped_dir: str = os.path.join(data_dir, "scraped")
     logs_dir: str = os.path.join(data_dir, "logs")
     cache_dir: str = os.path.join(data_dir, "cache")
     
+    # Raw response archiving (WARC)
+    archive_responses: bool = False
+    archive_dir: str = os.path.join(data_dir, "archive")
+    archive_max_file_bytes: int = 1024 * 1024 * 1024
+    
+    # robots.txt (policies are cached in memory and under cache_dir)
+    respect_robots_txt: bool = True
+    robots_user_agent: str = "WebScrapingTool"
+    robots_cache_dir: str = os.path.join(cache_dir, "robots")
+    robots_cache_ttl: float = 86400.0
+    robots_error_ttl: float = 300.0
+    robots_cache_size: int = 10000
+    robots_timeout: float = 10.0
+    robots_max_crawl_delay: float = 30.0
+    
+    # Link graph built from the links of saved scrapes
+    link_graph_enabled: bool = True
+    link_graph_dir: str = os.path.join(data_dir, "linkgraph")
+    link_graph_compact_after: int = 10000
+    
+    # State shared between worker processes (SQLite in WAL mode)
+    shared_state_path: str = os.path.join(data_dir, "state.db")
+    shared_state_flush_interval: float = 1.0
+    shared_state_busy_timeout: float = 5.0
+    
     class Config:
         env_file = ".env"
 
@@ -31,9 +31,30 @@ class TimeoutException(ScrapingException):
     def __init__(self, message: str = "Request timed out"):
         super().__init__(message, 408)
 
+class RobotsDisallowedException(ScrapingException):
+    """Raised when robots.txt does not allow fetching a URL"""
+    def __init__(self, message: str = "Disallowed by robots.txt"):
+        super().__init__(message, 403)
+
+class ServiceOverloadedException(ScrapingException):
+    """Raised when a request is shed because the scraper is at capacity"""
+    def __init__(self, message: str = "Service overloaded", retry_after: int = 1, status_code: int = 503):
+        self.retry_after = retry_after
+        super().__init__(message, status_code)
+
+class TooManyRequestsException(ServiceOverloadedException):
+    """Raised when a single client exceeds its share of scrape capacity"""
+    def __init__(self, message: str = "Too many requests", retry_after: int = 1):
+        super().__init__(message, retry_after, 429)
+
 def create_http_exception(exc: ScrapingException) -> HTTPException:
     """Convert custom exception to HTTPException"""
+    headers = None
+    if isinstance(exc, ServiceOverloadedException):
+        headers = {"Retry-After": str(exc.retry_after)}
+    
     return HTTPException(
         status_code=exc.status_code,
-        detail=exc.message
+        detail=exc.message,
+        headers=headers
     )
@@ -0,0 +1,434 @@
+# ===========================
+# app/core/link_graph.py
+# ===========================
+import fcntl
+import logging
+import mmap
+from array import array
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urldefrag, urlparse
+
+from app.core.config import settings
+from app.core.shared_state import SQLiteStore
+
+logger = logging.getLogger(__name__)
+
+# urls.status values
+UNKNOWN, OK, FAILED = 0, 1, 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    id INTEGER PRIMARY KEY,
+    url TEXT NOT NULL UNIQUE,
+    status INTEGER NOT NULL DEFAULT 0,
+    error TEXT
+);
+CREATE INDEX IF NOT EXISTS failed_urls ON urls (id) WHERE status = 2;
+CREATE TABLE IF NOT EXISTS delta_pages (
+    src INTEGER PRIMARY KEY,
+    seq INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS delta_edges (
+    src INTEGER NOT NULL,
+    dst INTEGER NOT NULL,
+    PRIMARY KEY (src, dst)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS delta_edges_by_dst ON delta_edges (dst);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+"""
+
+# SQLite limits the number of bound parameters per statement
+_CHUNK = 500
+
+_EMPTY = memoryview(b'').cast('I')
+
+def normalize_url(url: str) -> Optional[str]:
+    """URL as stored in the graph (fragment removed), or None for non-web links"""
+    url, _ = urldefrag(url.strip())
+    if urlparse(url).scheme not in ('http', 'https'):
+        return None
+    return url
+
+class CSRSegment:
+    """
+    Read-only adjacency lists in compressed sparse row form
+
+    offsets[n] .. offsets[n + 1] is the slice of targets holding node n's
+    neighbours. Both arrays are memory-mapped, so opening a segment costs
+    nothing up front and the OS page cache is shared between workers.
+    """
+
+    def __init__(self, offsets_path: Path, targets_path: Path):
+        self._maps: List[mmap.mmap] = []
+        self.offsets = self._map(offsets_path, 'Q')
+        self.targets = self._map(targets_path, 'I')
+        self.nodes = max(len(self.offsets) - 1, 0)
+
+    def neighbours(self, node: int) -> memoryview:
+        if node >= self.nodes:
+            return _EMPTY
+        return self.targets[self.offsets[node]:self.offsets[node + 1]]
+
+    def degree(self, node: int) -> int:
+        if node >= self.nodes:
+            return 0
+        return self.offsets[node + 1] - self.offsets[node]
+
+    @property
+    def edges(self) -> int:
+        return len(self.targets)
+
+    def close(self):
+        self.offsets.release()
+        self.targets.release()
+        for mapped in self._maps:
+            try:
+                mapped.close()
+            except BufferError:
+                pass  # a caller still holds a slice; the map goes with it
+
+    def _map(self, path: Path, typecode: str) -> memoryview:
+        if path.stat().st_size == 0:
+            return memoryview(b'').cast(typecode)
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._maps.append(mapped)
+        return memoryview(mapped).cast(typecode)
+
+class LinkGraph(SQLiteStore):
+    """
+    Persistent graph of the links found by scrapes
+
+    URLs are interned to integer ids in SQLite. Edges live in two CSR
+    segments (out-links and in-links) that are rebuilt by compaction;
+    pages saved since the last compaction sit in a small delta table and
+    replace the page's out-links in the segments. Each compaction writes a
+    new generation of segment files, so readers in other workers keep
+    using the generation their snapshot refers to.
+
+    Compaction is CPU-bound pure Python (a couple of seconds per million
+    edges), so serving workers leave it to a separate process
+    (app.cli.compact_links); a lock file ensures only one process at a
+    time does it.
+    """
+
+    SCHEMA = _SCHEMA
+
+    def __init__(self, directory: str = settings.link_graph_dir,
+                 compact_after: int = settings.link_graph_compact_after):
+        self.directory = Path(directory)
+        super().__init__(str(self.directory / 'graph.db'))
+        self.compact_after = compact_after
+
+        self._segments: Dict[int, Tuple[CSRSegment, CSRSegment]] = {}
+
+    def add_page(self, url: str, links: Iterable[str]) -> bool:
+        """Replace the out-links of a successfully scraped page
+
+        Returns True once enough pages have changed that compact() is due.
+        """
+        url = normalize_url(url) or url
+        targets = list(dict.fromkeys(filter(None, (normalize_url(link) for link in links))))
+
+        with self._transaction() as db:
+            db.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", ((target,) for target in [url] + targets))
+            ids = self._ids(db, [url] + targets)
+            src, dsts = ids[url], [ids[target] for target in targets]
+            db.execute("UPDATE urls SET status = ?, error = NULL WHERE id = ?", (OK, src))
+
+            seq = self._meta(db, 'seq') + 1
+            self._set_meta(db, 'seq', seq)
+            db.execute("DELETE FROM delta_edges WHERE src = ?", (src,))
+            db.executemany("INSERT OR IGNORE INTO delta_edges (src, dst) VALUES (?, ?)", ((src, dst) for dst in dsts))
+            db.execute(
+                "INSERT INTO delta_pages (src, seq) VALUES (?, ?) ON CONFLICT(src) DO UPDATE SET seq = excluded.seq",
+                (src, seq)
+            )
+            return seq - self._meta(db, 'compacted_seq') >= self.compact_after
+
+    def mark_status(self, url: str, ok: bool, error: Optional[str] = None):
+        """Record whether url could last be fetched; failed URLs count as broken links"""
+        url = normalize_url(url) or url
+        with self._transaction() as db:
+            node = self._intern(db, url)
+            db.execute("UPDATE urls SET status = ?, error = ? WHERE id = ?", (OK if ok else FAILED, error, node))
+
+    def out_links(self, url: str, limit: int = 100, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """Pages url links to, or None if url is not in the graph"""
+        with self._snapshot() as (db, out, _):
+            node = self._node(db, url)
+            if node is None:
+                return None
+            targets = self._out_targets(db, out, node)
+            return {"url": url, "total": len(targets), "links": self._urls(db, targets[offset:offset + limit])}
+
+    def in_links(self, url: str, limit: int = 100, offset: int = 0) -> Optional[Dict[str, Any]]:
+        """Pages linking to url, or None if url is not in the graph"""
+        with self._snapshot() as (db, _, inn):
+            node = self._node(db, url)
+            if node is None:
+                return None
+            sources = self._in_sources(db, inn, node)
+            return {"url": url, "total": len(sources), "links": self._urls(db, sources[offset:offset + limit])}
+
+    def degree(self, url: str) -> Optional[Dict[str, Any]]:
+        with self._snapshot() as (db, out, inn):
+            node = self._node(db, url)
+            if node is None:
+                return None
+            if self._in_delta(db, [node]):
+                out_degree = db.execute("SELECT COUNT(*) FROM delta_edges WHERE src = ?", (node,)).fetchone()[0]
+            else:
+                out_degree = out.degree(node)
+            return {"url": url, "in": len(self._in_sources(db, inn, node)), "out": out_degree}
+
+    def broken_links(self, url: Optional[str] = None, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """Failed URLs linked from url, or, without url, failed URLs anywhere with their in-degree"""
+        with self._snapshot() as (db, out, inn):
+            if url is not None:
+                node = self._node(db, url)
+                if node is None:
+                    return None
+                broken = []
+                targets = self._out_targets(db, out, node)
+                for i in range(0, len(targets), _CHUNK):
+                    chunk = targets[i:i + _CHUNK]
+                    broken.extend(db.execute(
+                        f"SELECT url, error FROM urls WHERE status = {FAILED} AND id IN ({','.join('?' * len(chunk))})",
+                        chunk
+                    ))
+                return [{"url": target, "error": error} for target, error in broken[:limit]]
+
+            failed = db.execute(f"SELECT id, url, error FROM urls WHERE status = {FAILED} ORDER BY id LIMIT ?", (limit,))
+            return [
+                {"url": target, "error": error, "linked_from": len(self._in_sources(db, inn, node))}
+                for node, target, error in failed.fetchall()
+            ]
+
+    def stats(self) -> Dict[str, int]:
+        with self._snapshot() as (db, out, _):
+            return {
+                "generation": self._meta(db, 'generation'),
+                "nodes": db.execute("SELECT COALESCE(MAX(id), 0) FROM urls").fetchone()[0],
+                "compacted_edges": out.edges,
+                "pending_pages": self._meta(db, 'seq') - self._meta(db, 'compacted_seq')
+            }
+
+    def compact(self) -> bool:
+        """Fold the delta into a new generation of CSR segments
+
+        Pages saved while compaction runs stay in the delta. Returns False if
+        nothing changed, another process compacted first or a compaction is
+        already running.
+        """
+        with self._compaction_lock() as acquired:
+            return acquired and self._compact()
+
+    def compacting(self) -> bool:
+        """Whether any process is compacting the graph right now"""
+        with self._compaction_lock() as acquired:
+            return not acquired
+
+    @contextmanager
+    def _compaction_lock(self):
+        """Non-blocking lock shared by every process and thread; yields whether it was taken"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with open(self.directory / 'compact.lock', 'a') as f:
+            try:
+                fcntl.flock(f, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                yield False
+                return
+            try:
+                yield True
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def _compact(self) -> bool:
+        with self._snapshot() as (db, out, _):
+            generation = self._meta(db, 'generation')
+            seq = self._meta(db, 'seq')
+            if seq == self._meta(db, 'compacted_seq'):
+                return False
+            nodes = db.execute("SELECT COALESCE(MAX(id), 0) FROM urls").fetchone()[0] + 1
+
+            delta: Dict[int, array] = {src: array('I') for (src,) in db.execute("SELECT src FROM delta_pages")}
+            for src, dst in db.execute("SELECT src, dst FROM delta_edges ORDER BY src, dst"):
+                delta[src].append(dst)
+
+            new_generation = generation + 1
+            paths = self._paths(new_generation)
+            edges, in_degree = self._write_out_segment(paths, nodes, out, delta)
+
+        self._write_in_segment(paths, nodes, edges, in_degree)
+
+        with self._transaction() as db:
+            if self._meta(db, 'generation') != generation:
+                for path in paths.values():
+                    path.unlink(missing_ok=True)
+                return False
+            db.execute("DELETE FROM delta_edges WHERE src IN (SELECT src FROM delta_pages WHERE seq <= ?)", (seq,))
+            db.execute("DELETE FROM delta_pages WHERE seq <= ?", (seq,))
+            self._set_meta(db, 'generation', new_generation)
+            self._set_meta(db, 'compacted_seq', seq)
+
+        # Keep the previous generation: readers may still hold snapshots of it
+        for path in self.directory.glob('g[0-9]*.*'):
+            if int(path.name[1:7]) < generation:
+                path.unlink(missing_ok=True)
+
+        logger.info(f"Compacted link graph to generation {new_generation}: {nodes - 1} urls, {edges} edges")
+        return True
+
+    def _write_out_segment(self, paths: Dict[str, Path], nodes: int, base: CSRSegment,
+                           delta: Dict[int, array]) -> Tuple[int, array]:
+        """Write out-link offsets and targets; returns the edge count and each node's in-degree"""
+        offsets = array('Q', [0])
+        in_degree = array('Q', bytes(8 * nodes))
+        position = 0
+
+        with open(paths['out_targets'], 'wb') as f:
+            for node in range(nodes):
+                targets = delta.get(node)
+                if targets is None:
+                    targets = base.neighbours(node)
+                f.write(targets)
+                for dst in targets:
+                    in_degree[dst] += 1
+                position += len(targets)
+                offsets.append(position)
+
+        with open(paths['out_offsets'], 'wb') as f:
+            offsets.tofile(f)
+        return position, in_degree
+
+    def _write_in_segment(self, paths: Dict[str, Path], nodes: int, edges: int, in_degree: array):
+        """Invert the out-link segment with a counting sort, sources ascending per node"""
+        offsets = array('Q', [0])
+        for count in in_degree:
+            offsets.append(offsets[-1] + count)
+        with open(paths['in_offsets'], 'wb') as f:
+            offsets.tofile(f)
+
+        with open(paths['in_targets'], 'wb') as f:
+            f.truncate(4 * edges)
+        if not edges:
+            return
+
+        cursor = offsets[:-1]
+        out = CSRSegment(paths['out_offsets'], paths['out_targets'])
+        with open(paths['in_targets'], 'r+b') as f, mmap.mmap(f.fileno(), 0) as mapped:
+            sources = memoryview(mapped).cast('I')
+            for src in range(out.nodes):
+                for dst in out.neighbours(src):
+                    sources[cursor[dst]] = src
+                    cursor[dst] += 1
+            sources.release()
+        out.close()
+
+    @contextmanager
+    def _snapshot(self):
+        """Read transaction with the segments of the generation it sees"""
+        db = self._connection()
+        db.execute("BEGIN")
+        try:
+            generation = self._meta(db, 'generation')
+            out, inn = self._open_generation(generation)
+            yield db, out, inn
+        finally:
+            db.execute("COMMIT")
+
+    def _open_generation(self, generation: int) -> Tuple[CSRSegment, CSRSegment]:
+        with self._lock:
+            segments = self._segments.get(generation)
+            if segments is None:
+                paths = self._paths(generation)
+                if generation == 0 or not paths['out_offsets'].exists():
+                    empty = self._empty_segment()
+                    return empty, empty
+                segments = (
+                    CSRSegment(paths['out_offsets'], paths['out_targets']),
+                    CSRSegment(paths['in_offsets'], paths['in_targets'])
+                )
+                # Older generations are only needed by snapshots already open
+                for old in [g for g in self._segments if g < generation - 1]:
+                    for segment in self._segments.pop(old):
+                        segment.close()
+                self._segments[generation] = segments
+            return segments
+
+    def _empty_segment(self) -> CSRSegment:
+        segment = CSRSegment.__new__(CSRSegment)
+        segment._maps = []
+        segment.offsets = memoryview(b'').cast('Q')
+        segment.targets = memoryview(b'').cast('I')
+        segment.nodes = 0
+        return segment
+
+    def _paths(self, generation: int) -> Dict[str, Path]:
+        return {
+            name: self.directory / f"g{generation:06d}.{name.replace('_', '.')}"
+            for name in ('out_offsets', 'out_targets', 'in_offsets', 'in_targets')
+        }
+
+    def _out_targets(self, db, out: CSRSegment, node: int) -> List[int]:
+        if self._in_delta(db, [node]):
+            return [dst for (dst,) in db.execute("SELECT dst FROM delta_edges WHERE src = ? ORDER BY dst", (node,))]
+        return out.neighbours(node).tolist()
+
+    def _in_sources(self, db, inn: CSRSegment, node: int) -> List[int]:
+        # Compacted edges from pages that were saved again since are stale
+        compacted = inn.neighbours(node).tolist()
+        stale = self._in_delta(db, compacted)
+        sources = [src for src in compacted if src not in stale]
+        sources.extend(src for (src,) in db.execute("SELECT src FROM delta_edges WHERE dst = ?", (node,)))
+        return sorted(sources)
+
+    def _in_delta(self, db, nodes: List[int]) -> set:
+        found = set()
+        for i in range(0, len(nodes), _CHUNK):
+            chunk = nodes[i:i + _CHUNK]
+            found.update(src for (src,) in db.execute(
+                f"SELECT src FROM delta_pages WHERE src IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        return found
+
+    def _ids(self, db, urls: List[str]) -> Dict[str, int]:
+        ids = {}
+        for i in range(0, len(urls), _CHUNK):
+            chunk = urls[i:i + _CHUNK]
+            ids.update(db.execute(f"SELECT url, id FROM urls WHERE url IN ({','.join('?' * len(chunk))})", chunk))
+        return ids
+
+    def _node(self, db, url: str) -> Optional[int]:
+        row = db.execute("SELECT id FROM urls WHERE url = ?", (normalize_url(url) or url,)).fetchone()
+        return row[0] if row else None
+
+    def _urls(self, db, nodes: List[int]) -> List[str]:
+        urls = {}
+        for i in range(0, len(nodes), _CHUNK):
+            chunk = nodes[i:i + _CHUNK]
+            urls.update(db.execute(f"SELECT id, url FROM urls WHERE id IN ({','.join('?' * len(chunk))})", chunk))
+        return [urls[node] for node in nodes]
+
+    @staticmethod
+    def _intern(db, url: str) -> int:
+        db.execute("INSERT OR IGNORE INTO urls (url) VALUES (?)", (url,))
+        return db.execute("SELECT id FROM urls WHERE url = ?", (url,)).fetchone()[0]
+
+    @staticmethod
+    def _meta(db, key: str) -> int:
+        row = db.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    @staticmethod
+    def _set_meta(db, key: str, value: int):
+        db.execute("INSERT INTO meta (key, value) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET value = excluded.value", (key, value))
+
+# Graph updated by every saved scrape
+link_graph = LinkGraph()
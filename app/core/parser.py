@@ -1,48 +1,120 @@
 # ===========================
 # app/core/parser.py
 # ===========================
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
 from urllib.parse import urljoin
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 import logging
+import re
 
 from app.models.schemas import LinkData, ImageData, FormData, FormInputData
 
 logger = logging.getLogger(__name__)
 
+# Subtrees that never hold main content and are skipped entirely
+BOILERPLATE_TAGS = {
+    'script', 'style', 'noscript', 'template', 'nav', 'footer', 'header',
+    'aside', 'form', 'iframe', 'svg', 'button', 'select', 'head'
+}
+
+# Elements that start a new text block; everything else is treated as inline
+BLOCK_TAGS = {
+    'p', 'div', 'article', 'section', 'main', 'li', 'td', 'th', 'dd', 'dt',
+    'blockquote', 'pre', 'figcaption', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6',
+    'table', 'ul', 'ol', 'dl', 'body'
+}
+
+# class/id tokens that mark a subtree as likely content or likely boilerplate
+POSITIVE_HINTS = {'article', 'body', 'content', 'entry', 'main', 'post', 'story', 'text', 'blog'}
+NEGATIVE_HINTS = {
+    'ad', 'ads', 'advert', 'banner', 'breadcrumb', 'breadcrumbs', 'comment', 'comments',
+    'cookie', 'footer', 'menu', 'nav', 'navbar', 'newsletter', 'popup', 'promo',
+    'related', 'share', 'sidebar', 'social', 'sponsor', 'subscribe', 'widget'
+}
+
+MIN_TEXT_LENGTH = 20
+MIN_CONTENT_WORDS = 10
+MIN_HINTED_WORDS = 4
+MAX_LINK_DENSITY = 0.33
+
+_HINT_SPLIT = re.compile(r'[\s_\-]+')
+
+def _class_hints(tag: Tag) -> Tuple[bool, bool]:
+    """Return (positive, negative) content hints from a tag's class and id"""
+    if tag.name in ('article', 'main'):
+        return True, False
+    if tag.name == 'body':
+        return False, False
+    
+    classes = tag.get('class') or []
+    tokens = set(_HINT_SPLIT.split(' '.join(classes + [tag.get('id') or '']).lower()))
+    return bool(tokens & POSITIVE_HINTS), bool(tokens & NEGATIVE_HINTS)
+
+class TextBlock:
+    """Text gathered under a single block element, with link statistics
+    
+    negative covers hints inherited from ancestors; own_negative only the
+    block element's own class and id.
+    """
+    __slots__ = ('tag', 'positive', 'negative', 'own_negative', 'parts', 'link_chars', '_text')
+    
+    def __init__(self, tag: str, positive: bool, negative: bool, own_negative: bool = False):
+        self.tag = tag
+        self.positive = positive
+        self.negative = negative
+        self.own_negative = own_negative
+        self.parts = []
+        self.link_chars = 0
+        self._text = None
+    
+    def add_text(self, text: str, in_link: bool):
+        self.parts.append(text)
+        if in_link:
+            self.link_chars += len(text.strip())
+    
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = ' '.join(' '.join(self.parts).split())
+        return self._text
+    
+    @property
+    def link_density(self) -> float:
+        return self.link_chars / len(self.text) if self.text else 1.0
+    
+    def is_content(self) -> bool:
+        """Whether the block looks like main content rather than boilerplate"""
+        if self.negative or len(self.text) <= MIN_TEXT_LENGTH:
+            return False
+        if self.link_density > MAX_LINK_DENSITY:
+            return False
+        
+        min_words = MIN_HINTED_WORDS if self.positive else MIN_CONTENT_WORDS
+        return len(self.text.split()) >= min_words
+
 class HTMLParser:
     def __init__(self, html_content: str, base_url: str):
         self.soup = BeautifulSoup(html_content, 'html.parser')
         self.base_url = base_url
     
     async def extract_text_content(self) -> List[str]:
-        """Extract all text content from the page"""
+        """Extract the main text content of the page
+        
+        Scores text blocks by length, link density and class/id hints in a
+        single pass over the tree, without modifying the shared soup.
+        """
         try:
-            # Remove script and style elements
-            for element in self.soup(["script", "style", "nav", "footer"]):
-                element.decompose()
+            blocks = self._collect_text_blocks()
             
-            # Get text from main content areas
-            content_selectors = ['main', 'article', '.content', '#content', '.main']
-            text_content = []
+            text_content = [block.text for block in blocks if block.is_content()]
             
-            # Try to find main content first
-            for selector in content_selectors:
-                content = self.soup.select(selector)
-                if content:
-                    for elem in content:
-                        text = elem.get_text(strip=True, separator=' ')
-                        if text and len(text) > 20:  # Filter out short texts
-                            text_content.append(text)
-                    break
-            
-            # If no main content found, get paragraphs
+            # Short pages rarely pass the density checks; keep their paragraphs
             if not text_content:
-                paragraphs = self.soup.find_all('p')
-                for p in paragraphs:
-                    text = p.get_text(strip=True)
-                    if text and len(text) > 20:
-                        text_content.append(text)
+                text_content = [
+                    block.text for block in blocks
+                    if block.tag == 'p' and not block.own_negative and len(block.text) > MIN_TEXT_LENGTH
+                ]
             
             return text_content[:50]  # Limit to 50 items
         
@@ -50,6 +122,46 @@ class HTMLParser:
             logger.error(f"Error extracting text content: {e}")
             return []
     
+    def _collect_text_blocks(self) -> List["TextBlock"]:
+        """Walk the tree once, grouping text into its nearest block element"""
+        blocks = []
+        root = TextBlock('document', positive=False, negative=False)
+        
+        # Iterative depth-first walk; each entry carries its block and link context
+        stack = [(self.soup, root, False)]
+        while stack:
+            node, block, in_link = stack.pop()
+            
+            if isinstance(node, NavigableString):
+                if not isinstance(node, PreformattedString):
+                    block.add_text(node, in_link)
+                continue
+            
+            if not isinstance(node, Tag):
+                continue
+            
+            name = node.name
+            if name in BOILERPLATE_TAGS:
+                continue
+            
+            if name in BLOCK_TAGS:
+                positive, negative = _class_hints(node)
+                # A content container (or article/main) inside a wrapper such as
+                # "has-sidebar" starts afresh instead of inheriting its hint
+                block = TextBlock(
+                    name,
+                    positive=block.positive or positive,
+                    negative=negative or (block.negative and not positive),
+                    own_negative=negative
+                )
+                blocks.append(block)
+            
+            in_link = in_link or name == 'a'
+            for child in reversed(node.contents):
+                stack.append((child, block, in_link))
+        
+        return blocks
+    
     async def extract_links(self) -> List[LinkData]:
         """Extract all links from the page"""
         try:
@@ -0,0 +1,214 @@
+# ===========================
+# app/core/profiler.py
+# ===========================
+import asyncio
+import sys
+import threading
+import time
+from collections import Counter, defaultdict
+from contextlib import nullcontext
+from typing import Any, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+# Stages inferred from the stack for work that happens outside our own code
+_STACK_STAGES = {
+    'serialize_response': 'serialization',
+    'jsonable_encoder': 'serialization',
+}
+
+_NULL_STAGE = nullcontext()
+
+class ProfilerBusyError(RuntimeError):
+    """Raised when a profile is requested while another one is running"""
+
+class _Stage:
+    """Marks the current asyncio task as being in a named stage"""
+    __slots__ = ('profiler', 'name', 'task', 'start')
+
+    def __init__(self, profiler: "SamplingProfiler", name: str):
+        self.profiler = profiler
+        self.name = name
+        self.task = None
+        self.start = 0.0
+
+    def __enter__(self):
+        try:
+            self.task = asyncio.current_task()
+        except RuntimeError:
+            self.task = None
+        self.profiler._task_stages[self.task].append(self.name)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = time.perf_counter() - self.start
+        profiler = self.profiler
+        profiler._stage_wall[self.name] += elapsed
+        profiler._stage_calls[self.name] += 1
+
+        stages = profiler._task_stages.get(self.task)
+        if stages:
+            stages.pop()
+            if not stages:
+                del profiler._task_stages[self.task]
+
+class SamplingProfiler:
+    """
+    On-demand sampling profiler for the event loop thread
+
+    While a profile runs, a background thread snapshots the loop thread's
+    Python stack every few milliseconds and tags each sample with the stage
+    (fetch, parse, extract_*, serialization, save) the running task is in.
+    When no profile is running, stage() returns a shared no-op context
+    manager, so instrumented code pays only an attribute check.
+    """
+
+    def __init__(self, interval: float = settings.profiler_interval_ms / 1000):
+        self.interval = interval
+        self.active = False
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread_id: Optional[int] = None
+        self._samples: Counter = Counter()
+        self._task_stages: Dict[Any, List[str]] = defaultdict(list)
+        self._stage_wall: Dict[str, float] = defaultdict(float)
+        self._stage_calls: Counter = Counter()
+        self._requests = 0
+        self._request_target: Optional[int] = None
+        self._requests_done: Optional[asyncio.Event] = None
+
+    def stage(self, name: str):
+        """Context manager attributing samples taken inside it to a stage"""
+        if not self.active:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def request_finished(self):
+        """Count a completed scrape towards a request-bounded profile"""
+        if not self.active:
+            return
+        self._requests += 1
+        if self._request_target is not None and self._requests >= self._request_target:
+            self._requests_done.set()
+
+    async def profile(self, seconds: Optional[float] = None, requests: Optional[int] = None,
+                      interval: Optional[float] = None) -> Dict[str, Any]:
+        """Sample the event loop for `seconds`, or until `requests` scrapes finish
+
+        The run is capped at PROFILER_MAX_SECONDS either way.
+        """
+        if not self._lock.acquire(blocking=False):
+            raise ProfilerBusyError("A profile is already running")
+
+        try:
+            self._reset(interval)
+            self._loop = asyncio.get_running_loop()
+            self._thread_id = threading.get_ident()
+            self._request_target = requests
+            self._requests_done = asyncio.Event()
+
+            duration = min(seconds or settings.profiler_max_seconds, settings.profiler_max_seconds)
+            stop = threading.Event()
+            sampler = threading.Thread(target=self._sample_loop, args=(stop,), name="profiler", daemon=True)
+
+            started = time.perf_counter()
+            self.active = True
+            sampler.start()
+            try:
+                if requests:
+                    try:
+                        await asyncio.wait_for(self._requests_done.wait(), timeout=duration)
+                    except asyncio.TimeoutError:
+                        pass
+                else:
+                    await asyncio.sleep(duration)
+            finally:
+                self.active = False
+                stop.set()
+                await asyncio.to_thread(sampler.join)
+
+            return self._report(time.perf_counter() - started)
+        finally:
+            self._lock.release()
+
+    def _reset(self, interval: Optional[float]):
+        self.interval = interval or settings.profiler_interval_ms / 1000
+        self._samples = Counter()
+        self._task_stages = defaultdict(list)
+        self._stage_wall = defaultdict(float)
+        self._stage_calls = Counter()
+        self._requests = 0
+
+    def _sample_loop(self, stop: threading.Event):
+        while not stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)
+            if frame is not None:
+                self._samples[self._take_sample(frame)] += 1
+
+    def _take_sample(self, frame) -> Tuple[str, Tuple[str, ...]]:
+        stack = []
+        while frame is not None and len(stack) < settings.profiler_max_depth:
+            code = frame.f_code
+            stack.append(f"{frame.f_globals.get('__name__', '?')}:{getattr(code, 'co_qualname', code.co_name)}")
+            frame = frame.f_back
+        stack.reverse()
+
+        return self._current_stage(stack), tuple(stack)
+
+    def _current_stage(self, stack: List[str]) -> str:
+        try:
+            task = asyncio.current_task(self._loop)
+        except RuntimeError:
+            task = None
+
+        stages = self._task_stages.get(task)
+        if stages:
+            try:
+                return stages[-1]
+            except IndexError:
+                pass  # the task left its stage while we were sampling
+
+        for entry in reversed(stack):
+            stage = _STACK_STAGES.get(entry.rsplit(':', 1)[-1].rsplit('.', 1)[-1])
+            if stage:
+                return stage
+
+        if task is None:
+            return 'idle' if stack and stack[-1].startswith('selectors:') else 'event_loop'
+        return 'other'
+
+    def _report(self, duration: float) -> Dict[str, Any]:
+        interval_ms = self.interval * 1000
+        stage_samples = Counter()
+        for (stage, _), count in self._samples.items():
+            stage_samples[stage] += count
+
+        stages = {}
+        for stage in sorted(set(stage_samples) | set(self._stage_calls)):
+            stages[stage] = {
+                "samples": stage_samples.get(stage, 0),
+                "sampled_ms": round(stage_samples.get(stage, 0) * interval_ms, 1),
+                "wall_ms": round(self._stage_wall.get(stage, 0.0) * 1000, 1),
+                "calls": self._stage_calls.get(stage, 0)
+            }
+
+        return {
+            "duration_seconds": round(duration, 3),
+            "interval_ms": interval_ms,
+            "samples": sum(self._samples.values()),
+            "requests": self._requests,
+            "stages": stages,
+            "collapsed": self._collapsed()
+        }
+
+    def _collapsed(self) -> List[str]:
+        """Samples in collapsed-stack format (flamegraph.pl / speedscope input)"""
+        lines = []
+        for (stage, stack), count in self._samples.most_common():
+            lines.append(';'.join((f"stage:{stage}",) + stack) + f" {count}")
+        return lines
+
+# Shared profiler for this process
+profiler = SamplingProfiler()
@@ -0,0 +1,175 @@
+# ===========================
+# app/core/resolver.py
+# ===========================
+import asyncio
+import ipaddress
+import logging
+import socket
+import time
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.config import settings
+from app.utils.singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+try:
+    import dns.asyncresolver
+except ImportError:  # dnspython is optional; without it TTLs fall back to DNS_CACHE_TTL
+    dns = None
+
+class _CacheEntry:
+    __slots__ = ('addresses', 'error', 'expires_at')
+
+    def __init__(self, addresses: List[str], error: Optional[str], expires_at: float):
+        self.addresses = addresses
+        self.error = error
+        self.expires_at = expires_at
+
+class DNSCache:
+    """
+    In-process cache of hostname lookups
+
+    Addresses come from the system resolver. Positive answers are kept for
+    DNS_CACHE_TTL; when dnspython is installed, their record TTL is looked
+    up in the background and replaces it, clamped to the configured bounds.
+    Failures are cached briefly so a dead host does not hit the resolver on
+    every retry. Concurrent lookups for the same host share one query.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = settings.dns_cache_size,
+        default_ttl: float = settings.dns_cache_ttl,
+        min_ttl: float = settings.dns_min_ttl,
+        max_ttl: float = settings.dns_max_ttl,
+        negative_ttl: float = settings.dns_negative_ttl,
+        ttl_query_timeout: float = settings.dns_ttl_query_timeout
+    ):
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.negative_ttl = negative_ttl
+        self.ttl_query_timeout = ttl_query_timeout
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._refreshing: Set[asyncio.Task] = set()
+        self.hits = 0
+        self.negative_hits = 0
+        self.misses = 0
+        self.failures = 0
+        self.lookup_seconds = 0.0
+
+    async def resolve(self, host: str) -> List[str]:
+        """Return the addresses for host, raising socket.gaierror if it does not resolve"""
+        if _is_ip_address(host):
+            return [host]
+
+        host = host.lower()
+        entry = self._entries.get(host)
+        if entry is not None and entry.expires_at > time.monotonic():
+            self._entries.move_to_end(host)
+            if entry.error is not None:
+                self.negative_hits += 1
+                raise socket.gaierror(entry.error)
+            self.hits += 1
+            return entry.addresses
+
+        # Callers arriving while a lookup for host is in flight share its answer
+        if host in self._pending:
+            self.hits += 1
+        return await single_flight(self._pending, host, lambda: self._lookup(host))
+
+    async def prefetch(self, hosts: Iterable[str]) -> Dict[str, bool]:
+        """Resolve distinct hosts concurrently; returns whether each resolved"""
+        distinct = sorted({host.lower() for host in hosts if host})
+        results = await asyncio.gather(*(self.resolve(host) for host in distinct), return_exceptions=True)
+        return {host: not isinstance(result, BaseException) for host, result in zip(distinct, results)}
+
+    def stats(self) -> Dict[str, float]:
+        lookups = self.hits + self.negative_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "negative_hits": self.negative_hits,
+            "misses": self.misses,
+            "failures": self.failures,
+            "hit_rate": round((self.hits + self.negative_hits) / lookups, 4) if lookups else 0.0,
+            "avg_resolution_ms": round(self.lookup_seconds / self.misses * 1000, 2) if self.misses else 0.0
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def _lookup(self, host: str) -> List[str]:
+        self.misses += 1
+        start = time.perf_counter()
+        try:
+            addresses, ttl = await self._query(host)
+        except OSError as e:
+            self.failures += 1
+            self._store(host, _CacheEntry([], str(e) or "Name resolution failed", time.monotonic() + self.negative_ttl))
+            raise socket.gaierror(str(e) or "Name resolution failed")
+        finally:
+            self.lookup_seconds += time.perf_counter() - start
+
+        ttl = min(max(ttl, self.min_ttl), self.max_ttl)
+        self._store(host, _CacheEntry(addresses, None, time.monotonic() + ttl))
+        return addresses
+
+    async def _query(self, host: str) -> Tuple[List[str], float]:
+        """Look up host's addresses and how long to keep them
+
+        Addresses come from the system resolver, so /etc/hosts and other NSS
+        sources apply. The answer is returned with the default TTL straight
+        away; dnspython, when installed, only refines the TTL afterwards.
+        """
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+
+        if dns is not None:
+            task = asyncio.create_task(self._refine_ttl(host, time.monotonic()))
+            self._refreshing.add(task)
+            task.add_done_callback(self._refreshing.discard)
+        return addresses, self.default_ttl
+
+    async def _refine_ttl(self, host: str, resolved_at: float):
+        """Expire host's cached answer after its record TTL instead of the default"""
+        ttl = await self._record_ttl(host)
+        entry = self._entries.get(host)
+        if ttl is None or entry is None or entry.error is not None:
+            return
+        entry.expires_at = resolved_at + min(max(ttl, self.min_ttl), self.max_ttl)
+
+    async def _record_ttl(self, host: str) -> Optional[float]:
+        """TTL of host's A and AAAA records, or None for names DNS doesn't know
+
+        Each query gives up after ttl_query_timeout, so a slow DNS server
+        costs at most that long, and only in the background.
+        """
+        answers = await asyncio.gather(
+            dns.asyncresolver.resolve(host, 'A', lifetime=self.ttl_query_timeout),
+            dns.asyncresolver.resolve(host, 'AAAA', lifetime=self.ttl_query_timeout),
+            return_exceptions=True
+        )
+        ttls = [answer.rrset.ttl for answer in answers if not isinstance(answer, BaseException)]
+        return min(ttls) if ttls else None
+
+    def _store(self, host: str, entry: _CacheEntry):
+        self._entries[host] = entry
+        self._entries.move_to_end(host)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+def _is_ip_address(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host.strip('[]'))
+        return True
+    except ValueError:
+        return False
+
+# Shared cache for every scrape in this process
+dns_cache = DNSCache()
@@ -0,0 +1,338 @@
+# ===========================
+# app/core/robots.py
+# ===========================
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import httpx
+
+from app.core.config import settings
+from app.utils.singleflight import single_flight
+
+logger = logging.getLogger(__name__)
+
+# Only the first 500 KiB of a robots.txt file are parsed (RFC 9309)
+MAX_ROBOTS_BYTES = 500 * 1024
+
+def _compile_pattern(pattern: str) -> "re.Pattern":
+    """Regex for a rule path with * wildcards and an optional $ end anchor"""
+    anchored = pattern.endswith('$')
+    if anchored:
+        pattern = pattern[:-1]
+    regex = '.*'.join(re.escape(part) for part in pattern.split('*'))
+    return re.compile(regex + ('$' if anchored else ''), re.S)
+
+class RobotsRules:
+    """
+    The allow/disallow rules of one robots.txt group, compiled for matching
+
+    The most specific (longest) matching rule wins and allow wins ties.
+    Plain prefixes are found with one dict lookup per distinct prefix
+    length, longest first; only rules with wildcards use regexes, and they
+    are only tried when they could beat the best prefix match.
+    """
+
+    __slots__ = ('_prefixes', '_lengths', '_wildcards', 'crawl_delay')
+
+    def __init__(self, rules: Iterable[Tuple[bool, str]] = (), crawl_delay: Optional[float] = None):
+        prefixes: Dict[str, bool] = {}
+        wildcards = []
+        for allow, path in rules:
+            if not path:
+                continue  # an empty Disallow allows everything
+            if '*' in path or path.endswith('$'):
+                wildcards.append((len(path), allow, _compile_pattern(path)))
+            else:
+                prefixes[path] = prefixes.get(path, False) or allow
+
+        self._prefixes = prefixes
+        self._lengths = sorted({len(path) for path in prefixes}, reverse=True)
+        # Longest first, and allow before disallow at equal length
+        self._wildcards = sorted(wildcards, key=lambda rule: (-rule[0], not rule[1]))
+        self.crawl_delay = crawl_delay
+
+    @classmethod
+    def allow_all(cls) -> "RobotsRules":
+        return cls()
+
+    @classmethod
+    def disallow_all(cls) -> "RobotsRules":
+        return cls([(False, '/')])
+
+    def allowed(self, path: str) -> bool:
+        """Whether path (including any query string) may be fetched"""
+        if path == '/robots.txt':
+            return True
+
+        best_length, best_allow = -1, True
+        for length in self._lengths:
+            if length > len(path):
+                continue
+            allow = self._prefixes.get(path[:length])
+            if allow is not None:
+                best_length, best_allow = length, allow
+                break
+
+        for length, allow, regex in self._wildcards:
+            if length < best_length or (length == best_length and not allow):
+                break
+            if regex.match(path):
+                best_length, best_allow = length, allow
+                break
+
+        return best_allow
+
+def parse_robots(text: str, agent: str = settings.robots_user_agent) -> RobotsRules:
+    """Compile the rules that apply to agent: its own groups if any, else the * groups"""
+    groups: List[Tuple[set, list, list]] = []
+    agents, rules, delays = None, None, None
+    collecting_agents = False
+
+    for line in text.splitlines():
+        line = line.split('#', 1)[0].strip()
+        field, sep, value = line.partition(':')
+        if not sep:
+            continue
+        field, value = field.strip().lower(), value.strip()
+
+        if field == 'user-agent':
+            if not collecting_agents:
+                agents, rules, delays = set(), [], []
+                groups.append((agents, rules, delays))
+                collecting_agents = True
+            agents.add(value.lower())
+            continue
+
+        collecting_agents = False
+        if agents is None:
+            continue  # rules before any user-agent line
+        if field in ('allow', 'disallow'):
+            rules.append((field == 'allow', value))
+        elif field == 'crawl-delay':
+            try:
+                delays.append(float(value))
+            except ValueError:
+                pass
+
+    agent = agent.lower()
+    matched = [group for group in groups if agent in group[0]] or [group for group in groups if '*' in group[0]]
+    crawl_delays = [delay for _, _, delays in matched for delay in delays]
+    return RobotsRules(
+        (rule for _, rules, _ in matched for rule in rules),
+        crawl_delay=max(crawl_delays) if crawl_delays else None
+    )
+
+class _CacheEntry:
+    __slots__ = ('rules', 'body', 'status', 'etag', 'last_modified', 'expires_at')
+
+    def __init__(self, rules: RobotsRules, body: Optional[str], status: int,
+                 etag: Optional[str], last_modified: Optional[str], expires_at: float):
+        self.rules = rules
+        self.body = body
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.expires_at = expires_at
+
+def _origin_and_path(url: str) -> Tuple[str, str]:
+    parts = urlsplit(url)
+    origin = f"{parts.scheme}://{parts.netloc.rpartition('@')[2]}".lower()
+    path = parts.path or '/'
+    if parts.query:
+        path += '?' + parts.query
+    return origin, path
+
+class RobotsCache:
+    """
+    robots.txt policies per origin, cached in memory and on disk
+
+    Each origin's file is fetched once per ROBOTS_CACHE_TTL and shared with
+    other workers through the disk cache. Expired entries are revalidated
+    with If-None-Match / If-Modified-Since. Following RFC 9309, a 4xx
+    response allows everything, while a 5xx or an unreachable robots.txt
+    (network error, timeout) keeps the last known rules or, without any,
+    disallows everything until the next attempt after ROBOTS_ERROR_TTL.
+    robots.txt is requested with ROBOTS_USER_AGENT appended to USER_AGENT,
+    so site owners can tell which group of rules applies to us.
+    """
+
+    def __init__(
+        self,
+        directory: str = settings.robots_cache_dir,
+        ttl: float = settings.robots_cache_ttl,
+        error_ttl: float = settings.robots_error_ttl,
+        max_entries: int = settings.robots_cache_size,
+        agent: str = settings.robots_user_agent
+    ):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self.error_ttl = error_ttl
+        self.max_entries = max_entries
+        self.agent = agent
+
+        self._entries: "OrderedDict[str, _CacheEntry]" = OrderedDict()
+        self._pending: Dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.disk_hits = 0
+        self.fetches = 0
+        self.revalidated = 0
+        self.errors = 0
+
+    async def allowed(self, url: str) -> bool:
+        """Whether robots.txt lets us fetch url"""
+        origin, path = _origin_and_path(url)
+        rules = await self._rules(origin)
+        return rules.allowed(path)
+
+    def crawl_delay(self, url: str) -> Optional[float]:
+        """Crawl-delay for url's origin, if its robots.txt is already cached in this process"""
+        entry = self._entries.get(_origin_and_path(url)[0])
+        return entry.rules.crawl_delay if entry is not None else None
+
+    async def prefetch(self, urls: Iterable[str]):
+        """Load the policies of every distinct origin in urls concurrently"""
+        origins = {_origin_and_path(url)[0] for url in urls}
+        await asyncio.gather(*(self._rules(origin) for origin in origins), return_exceptions=True)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "fetches": self.fetches,
+            "revalidated": self.revalidated,
+            "errors": self.errors
+        }
+
+    def clear(self):
+        self._entries.clear()
+
+    async def _rules(self, origin: str) -> RobotsRules:
+        entry = self._entries.get(origin)
+        if entry is not None and entry.expires_at > time.time():
+            self._entries.move_to_end(origin)
+            self.hits += 1
+            return entry.rules
+
+        # Callers arriving while origin's policy is loading share the result
+        return await single_flight(self._pending, origin, lambda: self._load(origin, entry))
+
+    async def _load(self, origin: str, stale: Optional[_CacheEntry]) -> RobotsRules:
+        if stale is None:
+            stale = await asyncio.to_thread(self._read_disk, origin)
+            if stale is not None and stale.expires_at > time.time():
+                self.disk_hits += 1
+                self._store(origin, stale)
+                return stale.rules
+
+        entry = await self._fetch(origin, stale)
+        self._store(origin, entry)
+        return entry.rules
+
+    async def _fetch(self, origin: str, stale: Optional[_CacheEntry]) -> _CacheEntry:
+        headers = {}
+        if stale is not None and stale.etag:
+            headers['If-None-Match'] = stale.etag
+        if stale is not None and stale.last_modified:
+            headers['If-Modified-Since'] = stale.last_modified
+
+        self.fetches += 1
+        try:
+            response = await self._request(f"{origin}/robots.txt", headers)
+            status = int(response.status_code)
+            if not 100 <= status < 600:
+                raise ValueError(f"invalid status {status}")
+        except Exception as e:
+            logger.warning(f"Could not fetch robots.txt for {origin}: {e}; disallowing until it is reachable")
+            self.errors += 1
+            return self._after_error(stale, RobotsRules.disallow_all())
+
+        now = time.time()
+        if status == 304 and stale is not None:
+            self.revalidated += 1
+            stale.expires_at = now + self.ttl
+            entry = stale
+        elif 200 <= status < 300:
+            body = response.content[:MAX_ROBOTS_BYTES].decode('utf-8', errors='replace')
+            entry = _CacheEntry(parse_robots(body, self.agent), body, status,
+                                response.headers.get('etag'), response.headers.get('last-modified'), now + self.ttl)
+        elif 400 <= status < 500:
+            entry = _CacheEntry(RobotsRules.allow_all(), None, status, None, None, now + self.ttl)
+        else:
+            logger.warning(f"robots.txt for {origin} returned {status}; disallowing until it recovers")
+            self.errors += 1
+            return self._after_error(stale, RobotsRules.disallow_all())
+
+        await asyncio.to_thread(self._write_disk, origin, entry)
+        return entry
+
+    def _after_error(self, stale: Optional[_CacheEntry], fallback: RobotsRules) -> _CacheEntry:
+        """Keep the last known rules for a while, else use fallback, and retry after error_ttl"""
+        expires_at = time.time() + self.error_ttl
+        if stale is not None:
+            stale.expires_at = expires_at
+            return stale
+        return _CacheEntry(fallback, None, 0, None, None, expires_at)
+
+    async def _request(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        from app.core.transport import create_transport
+        async with httpx.AsyncClient(
+            transport=create_transport(),
+            timeout=settings.robots_timeout,
+            follow_redirects=True,
+            headers={'User-Agent': f"{settings.user_agent} {self.agent}"}
+        ) as client:
+            return await client.get(url, headers=headers)
+
+    def _store(self, origin: str, entry: _CacheEntry):
+        self._entries[origin] = entry
+        self._entries.move_to_end(origin)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _disk_path(self, origin: str) -> Path:
+        return self.directory / f"{hashlib.sha1(origin.encode('utf-8')).hexdigest()[:20]}.json"
+
+    def _read_disk(self, origin: str) -> Optional[_CacheEntry]:
+        try:
+            record = json.loads(self._disk_path(origin).read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            return None
+        if record.get('origin') != origin:
+            return None
+
+        body = record.get('body')
+        rules = parse_robots(body, self.agent) if body is not None else RobotsRules.allow_all()
+        return _CacheEntry(rules, body, record['status'], record.get('etag'),
+                           record.get('last_modified'), record['expires_at'])
+
+    def _write_disk(self, origin: str, entry: _CacheEntry):
+        path = self._disk_path(origin)
+        record = {
+            'origin': origin,
+            'status': entry.status,
+            'body': entry.body,
+            'etag': entry.etag,
+            'last_modified': entry.last_modified,
+            'expires_at': entry.expires_at
+        }
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            # Write then rename so other workers never read a partial file
+            tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+            tmp.write_text(json.dumps(record), encoding='utf-8')
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Failed to cache robots.txt for {origin}: {e}")
+
+# Shared robots.txt cache for every fetch in this process
+robots_cache = RobotsCache()
@@ -5,13 +5,29 @@ import httpx
 from datetime import datetime
 import asyncio
 import logging
-from typing import List, Dict, Any
+import math
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from typing import TYPE_CHECKING, List, Dict, Any, AsyncIterator, AsyncContextManager, Callable, Optional, Tuple
+from urllib.parse import urlparse
 
-from app.core.parser import HTMLParser
 from app.core.validators import URLValidator, OptionsValidator
 from app.core.exceptions import *
-from app.models.schemas import ScrapingOption, ScrapeResponse, ScrapedData
+from app.models.schemas import ScrapingOption, ScrapeResponse, ScrapedData, RenderOptions
 from app.core.config import settings
+from app.core.admission import record_response_bytes, sleep_outside_slot
+from app.core.archive import response_archive
+from app.core.browser import browser_pool
+from app.core.link_graph import link_graph
+from app.core.resolver import dns_cache
+from app.core.robots import robots_cache
+from app.core.profiler import profiler
+from app.core.shared_state import shared_state
+from app.utils.warc import decode_html
+
+if TYPE_CHECKING:
+    from app.core.parser import HTMLParser
 
 logger = logging.getLogger(__name__)
 
@@ -29,69 +45,313 @@ class WebScraper:
             }
         }
     
-    async def scrape(self, url: str, options: List[ScrapingOption]) -> ScrapeResponse:
-        """Main scraping method"""
+    async def scrape(self, url: str, options: List[ScrapingOption],
+                     render: Optional[RenderOptions] = None,
+                     respect_robots: Optional[bool] = None) -> ScrapeResponse:
+        """Main scraping method; pass render options to load the page in a headless browser
+        
+        respect_robots overrides RESPECT_ROBOTS_TXT for this scrape.
+        """
         start_time = datetime.utcnow()
         
         try:
             # Validate inputs
             URLValidator.validate_url(url)
             OptionsValidator.validate_options(options)
+            self._validate_render(render)
             
             logger.info(f"Starting scrape of {url} with options: {options}")
+            await self._check_robots(url, respect_robots)
             
             # Fetch the page
-            html_content = await self._fetch_page(url)
+            with profiler.stage('fetch'):
+                if render:
+                    html_content = await self._render_page(url, render)
+                else:
+                    html_content = await self._fetch_page(url)
+            
+            # Parse and extract the content
+            result = await self.parse_html(html_content, url, options, start_time)
+            
+            logger.info(f"Successfully scraped {url}")
+            return result
+            
+        except ScrapingException as e:
+            logger.error(f"Scraping error for {url}: {e.message}")
+            return self._failed_response(url, start_time, options, e.message)
+        except Exception as e:
+            logger.error(f"Unexpected error scraping {url}: {e}")
+            return self._failed_response(url, start_time, options, f"Unexpected error: {str(e)}")
+    
+    async def scrape_batch(self, urls: List[str], options: List[ScrapingOption],
+                           render: Optional[RenderOptions] = None, concurrency: int = 4,
+                           admit: Optional[Callable[[], AsyncContextManager]] = None,
+                           respect_robots: Optional[bool] = None) -> List[ScrapeResponse]:
+        """Scrape several URLs concurrently, resolving all distinct hosts and
+        loading their robots.txt policies up front
+        
+        admit, if given, returns an async context manager entered around each
+        scrape (e.g. an admission slot); a ScrapingException it raises becomes
+        that URL's failed response. While per-host rate limiting is on, URLs
+        on the same host are scraped one after another, so each only waits
+        for its own slot instead of reserving one far ahead and being refused.
+        """
+        if not render:
+            await self.prefetch_hosts(urls)
+        if self._robots_enforced(respect_robots):
+            await robots_cache.prefetch(urls)
+        
+        limit = asyncio.Semaphore(concurrency)
+        host_queues = defaultdict(asyncio.Lock) if settings.rate_limit_per_minute > 0 else None
+        
+        async def scrape_one(url: str) -> ScrapeResponse:
+            async with host_queues[urlparse(url).hostname] if host_queues is not None else nullcontext():
+                async with limit:
+                    if admit is None:
+                        return await self.scrape(url, options, render, respect_robots)
+                    try:
+                        async with admit():
+                            return await self.scrape(url, options, render, respect_robots)
+                    except ScrapingException as e:
+                        return self._failed_response(url, datetime.utcnow(), options, e.message)
+        
+        return await asyncio.gather(*(scrape_one(url) for url in urls))
+    
+    async def prefetch_hosts(self, urls: List[str]) -> Dict[str, bool]:
+        """Warm the DNS cache for every distinct host in urls"""
+        if not settings.dns_cache_enabled:
+            return {}
+        
+        hosts = [urlparse(url).hostname for url in urls]
+        resolved = await dns_cache.prefetch(host for host in hosts if host)
+        logger.info(f"Prefetched DNS for {len(resolved)} hosts ({sum(resolved.values())} resolved)")
+        return resolved
+    
+    async def parse_html(self, html_content: str, url: str, options: List[ScrapingOption],
+                         timestamp: datetime = None) -> ScrapeResponse:
+        """Run extraction over already-fetched HTML, without any network I/O"""
+        with profiler.stage('parse'):
+            parser = self._build_parser(html_content, url)
+        scraped_data = await self._extract_data(parser, options)
+        
+        return ScrapeResponse(
+            url=url,
+            timestamp=timestamp or datetime.utcnow(),
+            options_used=options,
+            success=True,
+            data=scraped_data,
+            stats=self._calculate_stats(scraped_data)
+        )
+    
+    async def scrape_stream(self, url: str, options: List[ScrapingOption],
+                            render: Optional[RenderOptions] = None,
+                            respect_robots: Optional[bool] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """Scrape a page, yielding (event, payload) pairs as each stage completes
+        
+        Events are ``fetch`` once the page has been downloaded, ``result`` for
+        each option as soon as its extractor finishes, and a final ``complete``
+        carrying the full ScrapeResponse (also sent on failure).
+        """
+        start_time = datetime.utcnow()
+        data_dict = {}
+        
+        try:
+            URLValidator.validate_url(url)
+            OptionsValidator.validate_options(options)
+            self._validate_render(render)
             
-            # Parse the content
-            parser = HTMLParser(html_content, url)
-            scraped_data = await self._extract_data(parser, options)
+            logger.info(f"Starting streamed scrape of {url} with options: {options}")
+            await self._check_robots(url, respect_robots)
             
-            # Calculate statistics
-            stats = self._calculate_stats(scraped_data)
+            fetch_start = time.perf_counter()
+            with profiler.stage('fetch'):
+                if render:
+                    html_content = await self._render_page(url, render)
+                    status_code, content_bytes = None, len(html_content.encode('utf-8'))
+                else:
+                    response = await self._fetch_response(url)
+                    html_content = response.text
+                    status_code, content_bytes = response.status_code, len(response.content)
+            
+            yield "fetch", {
+                "status_code": status_code,
+                "content_bytes": content_bytes,
+                "fetch_ms": round((time.perf_counter() - fetch_start) * 1000, 2),
+                "rendered": render is not None
+            }
             
-            # Prepare result
-            result = ScrapeResponse(
+            with profiler.stage('parse'):
+                parser = self._build_parser(html_content, url)
+            extraction_methods = self._extraction_methods(parser)
+            
+            # Run extractors one at a time so each result is flushed to the
+            # client before the next one starts
+            for option in options:
+                if option not in extraction_methods:
+                    continue
+                
+                extract_start = time.perf_counter()
+                value = await self._safe_extract(option, extraction_methods[option])
+                field_name = self._field_name(option)
+                data_dict[field_name] = value
+                
+                yield "result", {
+                    "option": option.value,
+                    "field": field_name,
+                    "value": value,
+                    "extract_ms": round((time.perf_counter() - extract_start) * 1000, 2)
+                }
+            
+            scraped_data = ScrapedData(**data_dict)
+            yield "complete", ScrapeResponse(
                 url=url,
                 timestamp=start_time,
                 options_used=options,
                 success=True,
                 data=scraped_data,
-                stats=stats
+                stats=self._calculate_stats(scraped_data)
             )
-            
             logger.info(f"Successfully scraped {url}")
-            return result
             
         except ScrapingException as e:
             logger.error(f"Scraping error for {url}: {e.message}")
-            return ScrapeResponse(
-                url=url,
-                timestamp=start_time,
-                options_used=options,
-                success=False,
-                error=e.message,
-                data=ScrapedData(),
-                stats={}
-            )
+            yield "complete", self._failed_response(url, start_time, options, e.message)
         except Exception as e:
             logger.error(f"Unexpected error scraping {url}: {e}")
-            return ScrapeResponse(
-                url=url,
-                timestamp=start_time,
-                options_used=options,
-                success=False,
-                error=f"Unexpected error: {str(e)}",
-                data=ScrapedData(),
-                stats={}
+            yield "complete", self._failed_response(url, start_time, options, f"Unexpected error: {str(e)}")
+    
+    def _failed_response(self, url: str, start_time: datetime, options: List[ScrapingOption], error: str) -> ScrapeResponse:
+        """Build the response returned when a scrape fails"""
+        return ScrapeResponse(
+            url=url,
+            timestamp=start_time,
+            options_used=options,
+            success=False,
+            error=error,
+            data=ScrapedData(),
+            stats={}
+        )
+    
+    async def replay(self, url: str, options: List[ScrapingOption]) -> ScrapeResponse:
+        """Re-run extraction on the archived response for url, without fetching it"""
+        start_time = datetime.utcnow()
+        
+        try:
+            URLValidator.validate_url(url)
+            OptionsValidator.validate_options(options)
+            
+            archived = await asyncio.to_thread(response_archive.load, url)
+            if archived is None:
+                raise ScrapingException(f"No archived response for {url}", 404)
+            
+            _, headers, body = archived
+            html_content = decode_html(body, headers.get('content-type'))
+            return await self.parse_html(html_content, url, options, start_time)
+            
+        except ScrapingException as e:
+            logger.error(f"Replay error for {url}: {e.message}")
+            return self._failed_response(url, start_time, options, e.message)
+        except Exception as e:
+            logger.error(f"Unexpected error replaying {url}: {e}")
+            return self._failed_response(url, start_time, options, f"Unexpected error: {str(e)}")
+    
+    async def _archive_response(self, url: str, response: httpx.Response):
+        """Append the raw response to the WARC archive; failures never fail the scrape"""
+        try:
+            await response_archive.record(url, response)
+        except Exception as e:
+            logger.warning(f"Failed to archive response for {url}: {e}")
+    
+    async def _record_broken(self, url: str, error: str):
+        """Mark url as a broken link target in the link graph"""
+        try:
+            await asyncio.to_thread(link_graph.mark_status, url, False, error)
+        except Exception as e:
+            logger.warning(f"Failed to record broken link {url}: {e}")
+    
+    @staticmethod
+    def _validate_render(render: Optional[RenderOptions]):
+        if render and not settings.js_render_enabled:
+            raise ScrapingException("JavaScript rendering is not enabled on this server", 400)
+    
+    async def _render_page(self, url: str, render: RenderOptions) -> str:
+        """Load the page in a pooled headless browser and return the rendered DOM"""
+        await self._wait_for_host(url)
+        logger.info(f"Rendering {url} (wait until {render.wait_until.value})")
+        html_content = await browser_pool.render(
+            url,
+            wait_until=render.wait_until.value,
+            wait_for_selector=render.wait_for_selector,
+            timeout=render.timeout or settings.browser_page_timeout
+        )
+        
+        record_response_bytes(len(html_content))
+        return html_content
+    
+    @staticmethod
+    def _robots_enforced(respect_robots: Optional[bool]) -> bool:
+        return settings.respect_robots_txt if respect_robots is None else respect_robots
+    
+    async def _check_robots(self, url: str, respect_robots: Optional[bool]):
+        """Refuse the scrape if robots.txt disallows url"""
+        if not self._robots_enforced(respect_robots):
+            return
+        
+        with profiler.stage('robots'):
+            allowed = await robots_cache.allowed(url)
+        if not allowed:
+            shared_state.incr('robots_disallowed')
+            raise RobotsDisallowedException(f"Fetching {url} is disallowed by robots.txt")
+    
+    async def _wait_for_host(self, url: str):
+        """Space requests to one host RATE_LIMIT_PER_MINUTE apart, across all workers
+        
+        A cached robots.txt Crawl-delay (capped at ROBOTS_MAX_CRAWL_DELAY)
+        stretches the spacing further. The scrape's admission slot is lent
+        to other requests while it waits.
+        """
+        host = urlparse(url).hostname
+        interval = 60 / settings.rate_limit_per_minute if settings.rate_limit_per_minute > 0 else 0.0
+        crawl_delay = robots_cache.crawl_delay(url)
+        if crawl_delay:
+            interval = max(interval, min(crawl_delay, settings.robots_max_crawl_delay))
+        if interval <= 0 or not host:
+            return
+        
+        granted, delay = await asyncio.to_thread(
+            shared_state.reserve_host,
+            host.lower(),
+            interval,
+            settings.rate_limit_max_wait
+        )
+        if not granted:
+            shared_state.incr('rate_limited')
+            raise TooManyRequestsException(
+                f"Rate limit for {host} exceeded",
+                retry_after=max(1, math.ceil(delay - settings.rate_limit_max_wait))
             )
+        if delay > 0:
+            logger.info(f"Waiting {delay:.2f}s for the rate limit on {host}")
+            await sleep_outside_slot(delay)
+    
+    def _transport(self) -> httpx.AsyncBaseTransport:
+        """Transport for a new client, sharing the process SSL context and DNS cache"""
+        from app.core.transport import create_transport
+        return create_transport()
     
     async def _fetch_page(self, url: str) -> str:
         """Fetch the webpage content with retries"""
+        response = await self._fetch_response(url)
+        return response.text
+    
+    async def _fetch_response(self, url: str) -> httpx.Response:
+        """Fetch the webpage with retries and return the raw response"""
         last_error = None
+        unreachable = False
         
-        async with httpx.AsyncClient(**self.client_config) as client:
+        async with httpx.AsyncClient(transport=self._transport(), **self.client_config) as client:
             for attempt in range(self.max_retries):
+                await self._wait_for_host(url)
                 try:
                     logger.info(f"Fetching {url} (attempt {attempt + 1})")
                     
@@ -103,42 +363,49 @@ class WebScraper:
                     if 'text/html' not in content_type:
                         raise ParseException(f"Expected HTML content, got {content_type}")
                     
-                    return response.text
+                    record_response_bytes(len(response.content))
+                    if settings.archive_responses:
+                        await self._archive_response(url, response)
+                    return response
                     
                 except httpx.TimeoutException:
                     last_error = TimeoutException(f"Request timed out after {self.timeout} seconds")
+                    unreachable = True
                     logger.warning(f"Timeout on attempt {attempt + 1}")
                     
                 except httpx.ConnectError as e:
                     last_error = RequestException(f"Connection error: {str(e)}")
+                    unreachable = True
                     logger.warning(f"Connection error on attempt {attempt + 1}")
                     
                 except httpx.HTTPStatusError as e:
                     last_error = RequestException(f"HTTP error {e.response.status_code}")
+                    unreachable = True
                     logger.warning(f"HTTP error on attempt {attempt + 1}")
                     
                 except Exception as e:
                     last_error = RequestException(f"Unexpected error: {str(e)}")
+                    unreachable = False
                     logger.warning(f"Unexpected error on attempt {attempt + 1}")
                 
                 # Wait before retry with exponential backoff
                 if attempt < self.max_retries - 1:
                     await asyncio.sleep(2 ** attempt)
         
+        if unreachable and settings.link_graph_enabled:
+            await self._record_broken(url, last_error.message)
         raise last_error
     
-    async def _extract_data(self, parser: HTMLParser, options: List[ScrapingOption]) -> ScrapedData:
+    @staticmethod
+    def _build_parser(html_content: str, url: str) -> "HTMLParser":
+        """HTMLParser for a page; BeautifulSoup is only imported once the first page is parsed"""
+        from app.core.parser import HTMLParser
+        return HTMLParser(html_content, url)
+    
+    async def _extract_data(self, parser: "HTMLParser", options: List[ScrapingOption]) -> ScrapedData:
         """Extract data based on selected options"""
         data_dict = {}
-        
-        extraction_methods = {
-            ScrapingOption.TEXT: parser.extract_text_content,
-            ScrapingOption.LINKS: parser.extract_links,
-            ScrapingOption.IMAGES: parser.extract_images,
-            ScrapingOption.HEADINGS: parser.extract_headings,
-            ScrapingOption.META: parser.extract_meta_data,
-            ScrapingOption.FORMS: parser.extract_forms
-        }
+        extraction_methods = self._extraction_methods(parser)
         
         # Extract data concurrently
         tasks = []
@@ -155,15 +422,31 @@ class WebScraper:
                 logger.error(f"Error extracting {option}: {result}")
                 continue
             
-            field_name = "text_content" if option == ScrapingOption.TEXT else option.value
-            data_dict[field_name] = result
+            data_dict[self._field_name(option)] = result
         
         return ScrapedData(**data_dict)
     
+    def _extraction_methods(self, parser: "HTMLParser") -> Dict[ScrapingOption, Any]:
+        """Map each scraping option to its parser extraction method"""
+        return {
+            ScrapingOption.TEXT: parser.extract_text_content,
+            ScrapingOption.LINKS: parser.extract_links,
+            ScrapingOption.IMAGES: parser.extract_images,
+            ScrapingOption.HEADINGS: parser.extract_headings,
+            ScrapingOption.META: parser.extract_meta_data,
+            ScrapingOption.FORMS: parser.extract_forms
+        }
+    
+    @staticmethod
+    def _field_name(option: ScrapingOption) -> str:
+        """Name of the ScrapedData field that holds an option's result"""
+        return "text_content" if option == ScrapingOption.TEXT else option.value
+    
     async def _safe_extract(self, option: ScrapingOption, method):
         """Safely execute extraction method"""
         try:
-            return await method()
+            with profiler.stage(f"extract_{option.value}"):
+                return await method()
         except Exception as e:
             logger.error(f"Error in {option} extraction: {e}")
             return [] if option in [ScrapingOption.TEXT, ScrapingOption.LINKS, 
@@ -0,0 +1,241 @@
+# ===========================
+# app/core/shared_state.py
+# ===========================
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS counters (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS host_limits (
+    host TEXT PRIMARY KEY,
+    next_allowed REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS results (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    url TEXT NOT NULL,
+    path TEXT NOT NULL,
+    saved_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS results_by_url ON results (url, id);
+CREATE TABLE IF NOT EXISTS worker_metrics (
+    pid INTEGER PRIMARY KEY,
+    updated_at REAL NOT NULL,
+    metrics TEXT NOT NULL
+);
+"""
+
+# Host reservations this far in the past no longer affect anything
+_HOST_LIMIT_RETENTION = 3600
+
+class SQLiteStore:
+    """
+    A local SQLite database in WAL mode that several processes open at once
+
+    Readers never block the single writer, and writes are short
+    transactions that take the lock up front. Each thread gets its own
+    connection; subclasses provide the SCHEMA.
+    """
+
+    SCHEMA = ""
+
+    def __init__(self, path: str, busy_timeout: float = settings.shared_state_busy_timeout):
+        self.path = path
+        self.busy_timeout = busy_timeout
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._schema_ready = False
+        self._pid = os.getpid()
+
+    def close(self):
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for db in connections:
+            db.close()
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        if os.getpid() != self._pid:
+            # Connections must not be shared with a forked child
+            self._pid = os.getpid()
+            self._connections = []
+            self._local = threading.local()
+
+        db = getattr(self._local, 'db', None)
+        if db is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            db = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            if not self._schema_ready:
+                db.executescript(self.SCHEMA)
+                self._schema_ready = True
+
+            self._local.db = db
+            with self._lock:
+                self._connections.append(db)
+        return db
+
+    @contextmanager
+    def _transaction(self):
+        """Write transaction that takes the database lock up front"""
+        db = self._connection()
+        db.execute("BEGIN IMMEDIATE")
+        try:
+            yield db
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        else:
+            db.execute("COMMIT")
+
+class SharedState(SQLiteStore):
+    """
+    State shared by every worker process, kept in a local SQLite database
+
+    Counter increments are buffered in process and flushed in batches;
+    per-host rate limits, the index of saved results and worker metrics
+    are written straight through.
+    """
+
+    SCHEMA = _SCHEMA
+
+    def __init__(
+        self,
+        path: str = settings.shared_state_path,
+        flush_interval: float = settings.shared_state_flush_interval,
+        busy_timeout: float = settings.shared_state_busy_timeout
+    ):
+        super().__init__(path, busy_timeout)
+        self.flush_interval = flush_interval
+        self._pending: Counter = Counter()
+
+    def incr(self, name: str, amount: int = 1):
+        """Add to a shared counter; the change is visible to other workers after the next flush"""
+        with self._lock:
+            self._pending[name] += amount
+
+    def flush(self):
+        """Write buffered counter increments in one transaction"""
+        with self._lock:
+            pending, self._pending = self._pending, Counter()
+        if not pending:
+            return
+
+        try:
+            with self._transaction() as db:
+                db.executemany(
+                    "INSERT INTO counters (name, value) VALUES (?, ?) "
+                    "ON CONFLICT(name) DO UPDATE SET value = value + excluded.value",
+                    pending.items()
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to flush shared counters: {e}")
+            with self._lock:
+                self._pending.update(pending)
+
+    def counters(self) -> Dict[str, int]:
+        """Counter totals across all workers"""
+        self.flush()
+        rows = self._connection().execute("SELECT name, value FROM counters ORDER BY name")
+        return dict(rows.fetchall())
+
+    def reserve_host(self, host: str, interval: float, max_wait: float) -> Tuple[bool, float]:
+        """Reserve the next request slot for host, spacing requests `interval` seconds apart
+
+        Returns (granted, delay): when granted the caller should wait `delay`
+        seconds before sending. A slot more than `max_wait` seconds away is
+        not reserved; delay then says how far away it is.
+        """
+        now = time.time()
+        with self._transaction() as db:
+            row = db.execute("SELECT next_allowed FROM host_limits WHERE host = ?", (host,)).fetchone()
+            start = max(row[0] if row else 0.0, now)
+            delay = start - now
+            if delay > max_wait:
+                return False, delay
+
+            db.execute(
+                "INSERT INTO host_limits (host, next_allowed) VALUES (?, ?) "
+                "ON CONFLICT(host) DO UPDATE SET next_allowed = excluded.next_allowed",
+                (host, start + interval)
+            )
+        return True, delay
+
+    def record_result(self, url: str, path: str):
+        """Index a saved result file under the URL it was scraped from"""
+        with self._transaction() as db:
+            db.execute("INSERT INTO results (url, path, saved_at) VALUES (?, ?, ?)", (url, path, time.time()))
+
+    def latest_result(self, url: str) -> Optional[Dict[str, Any]]:
+        """Most recently saved result for url, as {"path", "saved_at"}"""
+        row = self._connection().execute(
+            "SELECT path, saved_at FROM results WHERE url = ? ORDER BY id DESC LIMIT 1", (url,)
+        ).fetchone()
+        if row is None:
+            return None
+        return {"path": row[0], "saved_at": row[1]}
+
+    def publish_metrics(self, metrics: Dict[str, Any]):
+        """Store this worker's metrics snapshot and drop snapshots from workers that went away"""
+        now = time.time()
+        with self._transaction() as db:
+            db.execute(
+                "INSERT INTO worker_metrics (pid, updated_at, metrics) VALUES (?, ?, ?) "
+                "ON CONFLICT(pid) DO UPDATE SET updated_at = excluded.updated_at, metrics = excluded.metrics",
+                (os.getpid(), now, json.dumps(metrics, default=str))
+            )
+            db.execute("DELETE FROM worker_metrics WHERE updated_at < ?", (now - self._metrics_max_age(),))
+            db.execute("DELETE FROM host_limits WHERE next_allowed < ?", (now - _HOST_LIMIT_RETENTION,))
+
+    def worker_metrics(self) -> Dict[int, Dict[str, Any]]:
+        """Latest metrics snapshot of every live worker, keyed by pid"""
+        rows = self._connection().execute(
+            "SELECT pid, updated_at, metrics FROM worker_metrics WHERE updated_at >= ? ORDER BY pid",
+            (time.time() - self._metrics_max_age(),)
+        )
+        return {pid: dict(json.loads(metrics), updated_at=updated_at) for pid, updated_at, metrics in rows}
+
+    async def publish_forever(self, snapshot: Callable[[], Dict[str, Any]], interval: Optional[float] = None):
+        """Flush counters and publish snapshot() until cancelled"""
+        interval = interval or self.flush_interval
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await asyncio.to_thread(self.flush)
+                await asyncio.to_thread(self.publish_metrics, snapshot())
+            except Exception as e:
+                logger.warning(f"Failed to publish worker metrics: {e}")
+
+    def retire(self):
+        """Flush pending counters, withdraw this worker's metrics and close connections"""
+        self.flush()
+        try:
+            with self._transaction() as db:
+                db.execute("DELETE FROM worker_metrics WHERE pid = ?", (os.getpid(),))
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to remove worker metrics: {e}")
+        self.close()
+
+    def _metrics_max_age(self) -> float:
+        return max(self.flush_interval * 10, 10.0)
+
+# State shared with the other workers serving this app
+shared_state = SharedState()
@@ -0,0 +1,81 @@
+# ===========================
+# app/core/transport.py
+# ===========================
+"""
+httpx transports for outgoing fetches
+
+Imported on the first fetch rather than at startup. On httpx 0.28+,
+which imports httpcore lazily itself, this keeps httpcore and its
+backends out of the app's import time.
+"""
+import socket
+import ssl
+from functools import lru_cache
+from typing import Optional
+
+import httpcore
+import httpx
+
+from app.core.config import settings
+from app.core.resolver import DNSCache, dns_cache
+
+_LIMITS = httpx.Limits(max_connections=100, max_keepalive_connections=20)
+
+@lru_cache(maxsize=None)
+def shared_ssl_context() -> ssl.SSLContext:
+    """One verifying SSL context for every client in this process
+
+    Loading the CA bundle takes tens of milliseconds, which every new
+    client would otherwise pay again.
+    """
+    return httpx.create_ssl_context()
+
+class CachingNetworkBackend(httpcore.AsyncNetworkBackend):
+    """httpcore network backend that resolves hostnames through a DNSCache
+
+    Only the TCP connect uses the resolved address; TLS still uses the
+    original hostname for SNI and certificate checks.
+    """
+
+    def __init__(self, cache: DNSCache, backend: Optional[httpcore.AsyncNetworkBackend] = None):
+        self.cache = cache
+        self.backend = backend or httpcore.AnyIOBackend()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        try:
+            addresses = await self.cache.resolve(host)
+        except socket.gaierror as e:
+            raise httpcore.ConnectError(f"Could not resolve {host}: {e}")
+
+        last_error = None
+        for address in addresses:
+            try:
+                return await self.backend.connect_tcp(address, port, timeout, local_address, socket_options)
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error
+
+    async def connect_unix_socket(self, path, timeout=None, socket_options=None):
+        return await self.backend.connect_unix_socket(path, timeout, socket_options)
+
+    async def sleep(self, seconds):
+        await self.backend.sleep(seconds)
+
+class DNSCachingTransport(httpx.AsyncHTTPTransport):
+    """httpx transport whose connections go through CachingNetworkBackend"""
+
+    def __init__(self, cache: DNSCache, limits: httpx.Limits = _LIMITS):
+        super().__init__(verify=shared_ssl_context(), limits=limits)
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=shared_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            network_backend=CachingNetworkBackend(cache)
+        )
+
+def create_transport() -> httpx.AsyncBaseTransport:
+    """Transport for a new client, using the shared SSL context and, if enabled, the DNS cache"""
+    if settings.dns_cache_enabled:
+        return DNSCachingTransport(dns_cache)
+    return httpx.AsyncHTTPTransport(verify=shared_ssl_context(), limits=_LIMITS)
@@ -14,9 +14,27 @@ class ScrapingOption(str, Enum):
     META = "meta"
     FORMS = "forms"
 
-class ScrapeRequest(BaseModel):
-    url: HttpUrl
+class WaitUntil(str, Enum):
+    DOMCONTENTLOADED = "domcontentloaded"
+    LOAD = "load"
+
+class RenderOptions(BaseModel):
+    wait_until: WaitUntil = WaitUntil.LOAD
+    wait_for_selector: Optional[str] = None
+    timeout: Optional[int] = Field(None, gt=0, le=120)
+
+class ScrapeSettings(BaseModel):
     options: List[ScrapingOption] = Field(..., min_items=1)
+    render_js: bool = False
+    render_options: RenderOptions = Field(default_factory=RenderOptions)
+    respect_robots: Optional[bool] = Field(None, description="Override the server's RESPECT_ROBOTS_TXT setting")
+    
+    def render_settings(self) -> Optional[RenderOptions]:
+        """Render options when JavaScript rendering was requested, else None"""
+        return self.render_options if self.render_js else None
+
+class ScrapeRequest(ScrapeSettings):
+    url: HttpUrl
     
     @validator('url')
     def validate_url(cls, v):
@@ -25,6 +43,9 @@ class ScrapeRequest(BaseModel):
             raise ValueError("URL too long")
         return v
 
+class BatchScrapeRequest(ScrapeSettings):
+    urls: List[HttpUrl] = Field(..., min_items=1, max_items=100)
+
 class LinkData(BaseModel):
     text: str
     href: str
@@ -63,6 +84,10 @@ class ScrapeResponse(BaseModel):
     data: ScrapedData
     stats: Dict[str, int] = {}
 
+class ProfileFormat(str, Enum):
+    COLLAPSED = "collapsed"
+    JSON = "json"
+
 class HealthResponse(BaseModel):
     status: str
     timestamp: datetime
@@ -159,9 +159,11 @@ class WebScraperApp {
         this.setButtonState(true);
 
         try {
-            const result = await this.scrapeWebsite(url, options);
+            const result = await this.scrapeWebsiteStream(url, options);
             
-            if (result.success) {
+            if (!result) {
+                this.showError('Scraping ended before results were received');
+            } else if (result.success) {
                 this.scrapedData = result;
                 this.displayResults(result);
                 this.showNotification('Scraping completed successfully!', 'success');
@@ -197,6 +199,131 @@ class WebScraperApp {
         return await response.json();
     }
 
+    async scrapeWebsiteStream(url, options) {
+        const response = await fetch(`${this.apiBaseUrl}/scrape/stream`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+                'Accept': 'text/event-stream'
+            },
+            body: JSON.stringify({
+                url: url,
+                options: options
+            })
+        });
+
+        if (!response.ok) {
+            const errorData = await response.json();
+            throw new Error(errorData.detail || `HTTP error! status: ${response.status}`);
+        }
+
+        // Browsers without streaming bodies fall back to the one-shot endpoint
+        if (!response.body || !window.TextDecoder) {
+            return await this.scrapeWebsite(url, options);
+        }
+
+        const partial = { url: url, options_used: options, data: {}, stats: {} };
+        const reader = response.body.getReader();
+        const decoder = new TextDecoder();
+        let buffer = '';
+        let result = null;
+
+        while (true) {
+            const { value, done } = await reader.read();
+            if (done) break;
+
+            buffer += decoder.decode(value, { stream: true });
+
+            // Events are separated by a blank line; keep any trailing partial frame
+            const frames = buffer.split('\n\n');
+            buffer = frames.pop();
+
+            for (const frame of frames) {
+                const event = this.parseSSEFrame(frame);
+                if (!event) continue;
+
+                if (event.type === 'complete') {
+                    result = event.data;
+                } else {
+                    this.handleStreamEvent(event.type, event.data, partial);
+                }
+            }
+        }
+
+        return result;
+    }
+
+    parseSSEFrame(frame) {
+        let type = 'message';
+        const dataLines = [];
+
+        frame.split('\n').forEach(line => {
+            if (line.startsWith('event:')) {
+                type = line.slice(6).trim();
+            } else if (line.startsWith('data:')) {
+                dataLines.push(line.slice(5).trim());
+            }
+        });
+
+        if (dataLines.length === 0) return null;
+
+        try {
+            return { type: type, data: JSON.parse(dataLines.join('\n')) };
+        } catch (error) {
+            console.error('Invalid stream event:', error);
+            return null;
+        }
+    }
+
+    handleStreamEvent(type, payload, partial) {
+        if (type === 'fetch') {
+            // Download metadata is not a statistic; keep it with the JSON only
+            partial.fetch = payload;
+        } else if (type === 'result') {
+            partial.data[payload.field] = payload.value;
+            partial.stats = this.calculateStats(partial.data);
+        } else {
+            return;
+        }
+
+        this.displayPartialResults(partial);
+    }
+
+    calculateStats(data) {
+        // Mirrors WebScraper._calculate_stats so partial and final cards match
+        const stats = {};
+
+        Object.entries(data).forEach(([key, value]) => {
+            if (value === null || value === undefined) return;
+
+            if (Array.isArray(value)) {
+                stats[`${key}_count`] = value.length;
+            } else if (typeof value === 'object') {
+                if (key === 'headings') {
+                    stats.total_headings = Object.values(value)
+                        .filter(Array.isArray)
+                        .reduce((total, items) => total + items.length, 0);
+                } else {
+                    stats[`${key}_fields`] = Object.keys(value).length;
+                }
+            }
+        });
+
+        return stats;
+    }
+
+    displayPartialResults(partial) {
+        // Swap the spinner for the results panel on the first event
+        if (this.isLoading) {
+            this.showLoading(false);
+            this.showResults();
+        }
+
+        this.scrapedData = partial;
+        this.displayStats(partial.stats);
+        this.displayJSON(partial);
+    }
+
     displayResults(data) {
         // Animate results appearance
         this.showResults();
@@ -218,6 +345,8 @@ class WebScraperApp {
         statsContainer.innerHTML = '';
         
         Object.entries(stats).forEach(([key, value]) => {
+            if (typeof value !== 'number') return;
+
             const statCard = document.createElement('div');
             statCard.className = 'stat-card';
             statCard.innerHTML = `
@@ -14,7 +14,7 @@ class FileHandler:
     async def save_json(data: Dict[str, Any], filename: str = None) -> str:
         """Save data as JSON file asynchronously"""
         if not filename:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
             filename = f"scraped_data_{timestamp}.json"
         
         filepath = Path(settings.scraped_dir) / filename
@@ -1,18 +1,30 @@
 # ===========================
 # app/utils/setup.py
 # ===========================
+import asyncio
 import os
 import logging
+import time
 from pathlib import Path
 from app.core.config import settings
 
+logger = logging.getLogger(__name__)
+
+# A small page that exercises every extractor once
+WARM_UP_HTML = """<html><head><title>Warm up</title><meta name="description" content="warm up"></head>
+<body><h1>Warm up</h1><p>Priming the parser before the first request arrives.</p>
+<a href="/next">next</a><img src="/image.png" alt="image">
+<form action="/search"><input name="q" type="text"></form></body></html>"""
+
 def create_directories():
     """Create necessary directories"""
     directories = [
         settings.data_dir,
         settings.scraped_dir,
         settings.logs_dir,
-        settings.cache_dir
+        settings.cache_dir,
+        settings.archive_dir,
+        settings.link_graph_dir
     ]
     
     for directory in directories:
@@ -29,4 +41,32 @@ def setup_logging():
             logging.FileHandler(log_file),
             logging.StreamHandler()
         ]
-    )
\ No newline at end of file
+    )
+
+def _load_lazy_dependencies():
+    """Import the parser and HTTP transport modules, load the CA bundle and compile templates"""
+    import app.core.parser  # noqa: F401  (BeautifulSoup)
+    from app.core.transport import create_transport, shared_ssl_context
+    from app.utils.templates import precompile_templates
+
+    shared_ssl_context()
+    create_transport()  # imports httpcore's connection pool and network backend
+    precompile_templates()
+
+async def warm_up():
+    """Do the one-off work of the first scrape and page render ahead of time
+
+    Started in the background by the lifespan, so the server takes requests
+    while this runs; blocking imports happen in a worker thread.
+    """
+    from app.core.scraper import WebScraper
+    from app.models.schemas import ScrapingOption
+
+    started = time.perf_counter()
+    try:
+        await asyncio.to_thread(_load_lazy_dependencies)
+        await WebScraper().parse_html(WARM_UP_HTML, "http://localhost/", list(ScrapingOption))
+    except Exception as e:
+        logger.warning(f"Warm-up failed: {e}")
+        return
+    logger.info(f"Warm-up finished in {(time.perf_counter() - started) * 1000:.0f}ms")
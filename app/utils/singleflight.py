@@ -0,0 +1,45 @@
+# ===========================
+# app/utils/singleflight.py
+# ===========================
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+async def single_flight(pending: Dict[Hashable, asyncio.Future], key: Hashable,
+                        call: Callable[[], Awaitable[T]]) -> T:
+    """Run call() for key once, sharing its outcome with concurrent callers for the same key
+
+    pending maps keys to the calls in flight and is owned by the caller. If
+    the task running the call is cancelled, the tasks waiting on it run the
+    call again instead of waiting forever.
+    """
+    while True:
+        future = pending.get(key)
+        if future is None:
+            break
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            task = asyncio.current_task()
+            # Retry only when the owner was cancelled, not this caller
+            if not future.cancelled() or (hasattr(task, 'cancelling') and task.cancelling()):
+                raise
+
+    future = asyncio.get_running_loop().create_future()
+    pending[key] = future
+    try:
+        result = await call()
+    except Exception as e:
+        del pending[key]
+        future.set_exception(e)
+        # Mark retrieved so an unobserved failure does not log a warning
+        future.exception()
+        raise
+    except BaseException:
+        del pending[key]
+        future.cancel()
+        raise
+    del pending[key]
+    future.set_result(result)
+    return result
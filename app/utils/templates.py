@@ -0,0 +1,31 @@
+# ===========================
+# app/utils/templates.py
+# ===========================
+from functools import lru_cache
+from typing import TYPE_CHECKING
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from fastapi.templating import Jinja2Templates
+
+TEMPLATES_DIR = "app/templates"
+
+@lru_cache(maxsize=None)
+def get_templates() -> "Jinja2Templates":
+    """The app's one template environment, created (and Jinja2 imported) on first use"""
+    from fastapi.templating import Jinja2Templates
+
+    templates = Jinja2Templates(directory=TEMPLATES_DIR)
+    # Outside development, templates don't change while the app runs, so
+    # skip the modification check on every render
+    templates.env.auto_reload = settings.environment == "development"
+    return templates
+
+def precompile_templates() -> int:
+    """Compile every template into the environment's cache; returns how many"""
+    env = get_templates().env
+    names = env.list_templates()
+    for name in names:
+        env.get_template(name)
+    return len(names)
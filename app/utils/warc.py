@@ -0,0 +1,199 @@
+# ===========================
+# app/utils/warc.py
+# ===========================
+import gzip
+import re
+import uuid
+import zlib
+from datetime import datetime
+from typing import Dict, Iterator, Optional, Tuple
+
+_CHARSET = re.compile(r'charset=["\']?([\w\-]+)', re.I)
+
+class WarcRecord:
+    """A single WARC record: its headers and raw content block"""
+
+    def __init__(self, headers: Dict[str, str], block: bytes, offset: int = 0):
+        self.headers = headers
+        self.block = block
+        self.offset = offset
+
+    @property
+    def type(self) -> str:
+        return self.headers.get('warc-type', '')
+
+    @property
+    def record_id(self) -> str:
+        return self.headers.get('warc-record-id', '')
+
+    @property
+    def target_uri(self) -> str:
+        return self.headers.get('warc-target-uri', '')
+
+    def http_response(self) -> Tuple[int, Dict[str, str], bytes]:
+        """Split a response record's block into status code, HTTP headers and body
+        
+        The body is as recorded, so it may still be chunked or compressed;
+        see decode_payload.
+        """
+        head, _, body = self.block.partition(b'\r\n\r\n')
+        lines = head.decode('iso-8859-1').split('\r\n')
+
+        try:
+            status = int(lines[0].split()[1])
+        except (IndexError, ValueError):
+            status = 0
+
+        headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            if name:
+                headers[name.strip().lower()] = value.strip()
+
+        return status, headers, body
+
+def _dechunk(body: bytes) -> bytes:
+    """Join the chunks of a Transfer-Encoding: chunked body"""
+    chunks = []
+    position = 0
+    while True:
+        line_end = body.find(b'\r\n', position)
+        if line_end < 0:
+            raise ValueError("Truncated chunked body")
+        try:
+            size = int(body[position:line_end].split(b';')[0], 16)
+        except ValueError:
+            raise ValueError("Malformed chunked body")
+        if size == 0:
+            return b''.join(chunks)
+
+        start = line_end + 2
+        if start + size > len(body):
+            raise ValueError("Truncated chunked body")
+        chunks.append(body[start:start + size])
+        position = start + size + 2
+
+def decode_payload(headers: Dict[str, str], body: bytes) -> bytes:
+    """Undo the Transfer-Encoding and Content-Encoding of a recorded HTTP body
+    
+    headers are lower-cased HTTP headers as returned by http_response.
+    Raises ValueError for encodings that are unsupported or corrupt.
+    """
+    if 'chunked' in headers.get('transfer-encoding', '').lower():
+        body = _dechunk(body)
+
+    codings = [c.strip().lower() for c in headers.get('content-encoding', '').split(',') if c.strip()]
+    # Codings are listed in the order they were applied
+    for coding in reversed(codings):
+        try:
+            if coding in ('gzip', 'x-gzip'):
+                body = gzip.decompress(body)
+            elif coding == 'deflate':
+                # Servers send both zlib-wrapped and raw deflate streams
+                try:
+                    body = zlib.decompress(body)
+                except zlib.error:
+                    body = zlib.decompress(body, -zlib.MAX_WBITS)
+            elif coding != 'identity':
+                raise ValueError(f"Unsupported Content-Encoding: {coding}")
+        except (OSError, EOFError, zlib.error) as e:
+            raise ValueError(f"Corrupt {coding} body: {e}")
+
+    return body
+
+def _read_record(f, offset: int) -> Optional[WarcRecord]:
+    """Read the next record from a binary stream, or None at end of file"""
+    line = f.readline()
+    while line and not line.strip():
+        line = f.readline()
+    if not line:
+        return None
+    if not line.startswith(b'WARC/'):
+        raise ValueError(f"Malformed WARC record at offset {offset}")
+
+    headers = {}
+    for line in iter(f.readline, b''):
+        if not line.strip():
+            break
+        name, _, value = line.decode('utf-8', 'replace').partition(':')
+        headers[name.strip().lower()] = value.strip()
+
+    block = f.read(int(headers.get('content-length', 0)))
+    return WarcRecord(headers, block, offset)
+
+def iter_warc_records(path: str) -> Iterator[WarcRecord]:
+    """Read records from a WARC file, gzip-compressed or not
+    
+    Record offsets are positions in the uncompressed stream.
+    """
+    opener = gzip.open if str(path).endswith('.gz') else open
+
+    with opener(path, 'rb') as f:
+        while True:
+            record = _read_record(f, f.tell())
+            if record is None:
+                break
+            yield record
+
+def read_warc_record(path: str, offset: int) -> WarcRecord:
+    """Read the single record starting at a compressed byte offset in a .warc.gz file"""
+    with open(path, 'rb') as f:
+        f.seek(offset)
+        with gzip.GzipFile(fileobj=f) as gz:
+            record = _read_record(gz, offset)
+
+    if record is None:
+        raise ValueError(f"No WARC record at offset {offset} in {path}")
+    return record
+
+class WarcWriter:
+    """Appends records to a .warc.gz file, one gzip member per record
+    
+    Compressing each record separately lets readers seek straight to a
+    record's offset without decompressing the rest of the file.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def write_record(self, warc_type: str, block: bytes, headers: Dict[str, str] = None) -> Tuple[int, int]:
+        """Append a record and return its (offset, compressed length)"""
+        record_headers = {
+            'WARC-Type': warc_type,
+            'WARC-Record-ID': f"<urn:uuid:{uuid.uuid4()}>",
+            'WARC-Date': datetime.utcnow().strftime('%Y-%m-%dT%H:%M:%SZ'),
+        }
+        record_headers.update(headers or {})
+        record_headers['Content-Length'] = str(len(block))
+
+        head = 'WARC/1.0\r\n' + ''.join(f"{name}: {value}\r\n" for name, value in record_headers.items()) + '\r\n'
+        data = gzip.compress(head.encode('utf-8') + block + b'\r\n\r\n')
+
+        with open(self.path, 'ab') as f:
+            offset = f.tell()
+            f.write(data)
+
+        return offset, len(data)
+
+    def write_response(self, url: str, status: int, reason: str, headers: Dict[str, str], body: bytes) -> Tuple[int, int]:
+        """Append an HTTP response record for url"""
+        status_line = f"HTTP/1.1 {status} {reason}".rstrip()
+        head = status_line + '\r\n' + ''.join(f"{name}: {value}\r\n" for name, value in headers.items()) + '\r\n'
+        block = head.encode('iso-8859-1', errors='replace') + body
+
+        return self.write_record('response', block, {
+            'WARC-Target-URI': url,
+            'Content-Type': 'application/http; msgtype=response'
+        })
+
+def decode_html(body: bytes, content_type: Optional[str] = None) -> str:
+    """Decode an HTML body using the declared charset, falling back to detection"""
+    match = _CHARSET.search(content_type or '')
+    if match:
+        try:
+            return body.decode(match.group(1), errors='replace')
+        except LookupError:
+            pass
+
+    from bs4 import UnicodeDammit  # only needed for bodies without a usable charset
+    return UnicodeDammit(body, is_html=True).unicode_markup or ''
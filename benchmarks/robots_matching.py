@@ -0,0 +1,76 @@
+# ===========================
+# benchmarks/robots_matching.py
+# ===========================
+"""
+Cost of a robots.txt check once an origin's rules are cached.
+
+Builds a robots.txt with a realistic mix of prefix and wildcard rules,
+then times RobotsRules.allowed on raw paths and RobotsCache.allowed on
+full URLs (URL splitting plus the in-memory cache lookup).
+
+Usage:
+    python benchmarks/robots_matching.py [--rules N] [--checks N]
+"""
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.robots import RobotsCache, parse_robots, _CacheEntry
+
+def build_robots(rules: int) -> str:
+    lines = ["User-agent: *"]
+    for i in range(rules):
+        kind = "Allow" if i % 5 == 0 else "Disallow"
+        if i % 10 == 0:
+            lines.append(f"{kind}: /section{i}/*.json$")
+        else:
+            lines.append(f"{kind}: /section{i}/private/")
+    return "\n".join(lines)
+
+def build_paths(rules: int, count: int):
+    random.seed(0)
+    paths = []
+    for _ in range(count):
+        section = random.randrange(rules * 2)
+        leaf = random.choice(["private/page.html", "public/page.html", "data.json", "data.json?x=1"])
+        paths.append(f"/section{section}/{leaf}")
+    return paths
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--rules", type=int, default=200, help="rules in the robots.txt file")
+    arg_parser.add_argument("--checks", type=int, default=1_000_000, help="paths to check")
+    args = arg_parser.parse_args()
+
+    text = build_robots(args.rules)
+    start = time.perf_counter()
+    rules = parse_robots(text)
+    print(f"parse + compile {args.rules} rules: {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    paths = build_paths(args.rules, args.checks)
+    start = time.perf_counter()
+    allowed = sum(map(rules.allowed, paths))
+    elapsed = time.perf_counter() - start
+    print(f"RobotsRules.allowed: {elapsed / len(paths) * 1e6:.2f} us/check ({allowed} of {len(paths)} allowed)")
+
+    cache = RobotsCache(directory=tempfile.mkdtemp())
+    cache._store("https://example.com", _CacheEntry(rules, text, 200, None, None, time.time() + 3600))
+    urls = [f"https://example.com{path}" for path in paths]
+
+    async def check_all():
+        for url in urls:
+            await cache.allowed(url)
+
+    start = time.perf_counter()
+    asyncio.run(check_all())
+    elapsed = time.perf_counter() - start
+    print(f"RobotsCache.allowed (cached): {elapsed / len(urls) * 1e6:.2f} us/check")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# ===========================
+# benchmarks/startup_time.py
+# ===========================
+"""
+Import time and cold-start latency of the API process, checked against a budget.
+
+Three things are measured, each in fresh processes:
+
+  import      wall time of `import main` (median of --runs)
+  ready       from launching uvicorn until /api/health answers
+  first page  latency of the first GET / and the first /api/scrape of a
+              page from a local origin, i.e. what the first users of a
+              freshly scaled-up container wait for; sent right after
+              readiness, or --delay seconds later to see the effect of the
+              startup warm-up once it has finished
+
+The run also checks that `import main` leaves the heavy, lazily loaded
+dependencies (BeautifulSoup, Jinja2, uvicorn, selenium) unimported.
+It exits with status 1 if that check fails or a measurement exceeds its
+budget, so it can gate changes that slow down startup. Budgets are in
+milliseconds and can be overridden per machine.
+
+Usage:
+    python benchmarks/startup_time.py [--runs 5] [--import-budget 900]
+        [--ready-budget 3000] [--first-scrape-budget 1500] [--delay 0] [--no-warm-up]
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import httpx
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from worker_scaling import PAGES, free_port, serve_origin  # noqa: E402
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Must not be imported by `import main`; they load on first use or in the warm-up
+LAZY_MODULES = ["bs4", "jinja2", "uvicorn", "selenium"]
+
+IMPORT_SCRIPT = f"""
+import json, sys, time
+started = time.perf_counter()
+import main
+elapsed = time.perf_counter() - started
+print(json.dumps({{"seconds": elapsed, "loaded": [m for m in {LAZY_MODULES!r} if m in sys.modules]}}))
+"""
+
+def measure_import(runs: int) -> dict:
+    timings, loaded = [], set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_SCRIPT], cwd=str(ROOT),
+                                capture_output=True, text=True, check=True).stdout
+        result = json.loads(output.strip().splitlines()[-1])
+        timings.append(result["seconds"] * 1000)
+        loaded.update(result["loaded"])
+    return {"import_ms": statistics.median(timings), "loaded": sorted(loaded)}
+
+def measure_cold_start(origin_url: str, warm_up: bool, delay: float) -> dict:
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp)
+        env = dict(
+            os.environ,
+            RATE_LIMIT_PER_MINUTE="0",
+            WARM_UP_ON_STARTUP="true" if warm_up else "false",
+            DATA_DIR=str(data_dir),
+            SCRAPED_DIR=str(data_dir / "scraped"),
+            LOGS_DIR=str(data_dir / "logs"),
+            CACHE_DIR=str(data_dir / "cache"),
+            ARCHIVE_DIR=str(data_dir / "archive"),
+            SHARED_STATE_PATH=str(data_dir / "state.db"),
+            LINK_GRAPH_DIR=str(data_dir / "linkgraph"),
+            ROBOTS_CACHE_DIR=str(data_dir / "cache" / "robots"),
+        )
+        command = [
+            sys.executable, "-m", "uvicorn", "main:app",
+            "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning", "--no-access-log"
+        ]
+
+        started = time.perf_counter()
+        process = subprocess.Popen(command, cwd=str(ROOT), env=env)
+        try:
+            with httpx.Client(timeout=30.0) as client:
+                while True:
+                    try:
+                        if client.get(f"{app_url}/api/health").status_code == 200:
+                            break
+                    except httpx.HTTPError:
+                        pass
+                    if process.poll() is not None or time.perf_counter() - started > 60:
+                        raise RuntimeError("the app did not come up")
+                    time.sleep(0.01)
+                ready = time.perf_counter() - started
+                time.sleep(delay)
+
+                request_started = time.perf_counter()
+                client.get(f"{app_url}/").raise_for_status()
+                first_page = time.perf_counter() - request_started
+
+                request_started = time.perf_counter()
+                response = client.post(f"{app_url}/api/scrape",
+                                       json={"url": f"{origin_url}/{PAGES[0]}", "options": ["text", "links", "meta"]})
+                first_scrape = time.perf_counter() - request_started
+                if response.status_code != 200 or not response.json()["success"]:
+                    raise RuntimeError(f"first scrape failed: {response.text[:200]}")
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    return {"ready_ms": ready * 1000, "first_page_ms": first_page * 1000, "first_scrape_ms": first_scrape * 1000}
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--runs", type=int, default=5, help="fresh interpreters to time `import main` in")
+    arg_parser.add_argument("--import-budget", type=float, default=900.0, help="max median import time (ms)")
+    arg_parser.add_argument("--ready-budget", type=float, default=3000.0, help="max time until /api/health answers (ms)")
+    arg_parser.add_argument("--first-scrape-budget", type=float, default=1500.0, help="max latency of the first scrape (ms)")
+    arg_parser.add_argument("--delay", type=float, default=0.0, help="seconds to wait after readiness before the first requests")
+    arg_parser.add_argument("--no-warm-up", action="store_true", help="start the app with WARM_UP_ON_STARTUP=false")
+    args = arg_parser.parse_args()
+
+    origin_port = free_port()
+    origin = multiprocessing.Process(target=serve_origin, args=(origin_port,), daemon=True)
+    origin.start()
+    origin_url = f"http://127.0.0.1:{origin_port}"
+
+    try:
+        imports = measure_import(args.runs)
+        cold = measure_cold_start(origin_url, warm_up=not args.no_warm_up, delay=args.delay)
+    finally:
+        origin.terminate()
+
+    checks = [
+        ("import main", imports["import_ms"], args.import_budget),
+        ("ready", cold["ready_ms"], args.ready_budget),
+        ("first GET /", cold["first_page_ms"], None),
+        ("first scrape", cold["first_scrape_ms"], args.first_scrape_budget),
+    ]
+
+    failed = False
+    print(f"{'measurement':<14} {'ms':>9} {'budget':>9}")
+    for name, value, budget in checks:
+        over = budget is not None and value > budget
+        failed |= over
+        budget_text = f"{budget:>9.0f}" if budget is not None else f"{'-':>9}"
+        print(f"{name:<14} {value:>9.1f} {budget_text}{'  OVER BUDGET' if over else ''}")
+
+    if imports["loaded"]:
+        failed = True
+        print(f"\n`import main` loaded lazily imported modules: {', '.join(imports['loaded'])}")
+
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
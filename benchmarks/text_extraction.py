@@ -0,0 +1,103 @@
+# ===========================
+# benchmarks/text_extraction.py
+# ===========================
+"""
+Accuracy and throughput benchmark for HTMLParser.extract_text_content.
+
+Accuracy is measured against the labeled pages in benchmarks/corpus/text:
+each page lists snippets that must appear in the extracted text (content)
+and snippets that must not (boilerplate). Throughput is measured on the
+corpus and on pages of growing size to check that cost stays linear.
+
+Usage:
+    python benchmarks/text_extraction.py [--repeat N]
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from app.core.parser import HTMLParser
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus" / "text"
+
+def load_corpus():
+    """Load (name, html, labels) tuples for every labeled page"""
+    labels = json.loads((CORPUS_DIR / "labels.json").read_text(encoding="utf-8"))
+    return [
+        (name, (CORPUS_DIR / name).read_text(encoding="utf-8"), label)
+        for name, label in sorted(labels.items())
+    ]
+
+def extract(html: str):
+    parser = HTMLParser(html, "https://example.com/")
+    return asyncio.run(parser.extract_text_content())
+
+def score_accuracy(corpus):
+    """Return per-page and overall content recall and boilerplate rejection"""
+    found_total = content_total = rejected_total = boilerplate_total = 0
+    rows = []
+
+    for name, html, label in corpus:
+        text = "\n".join(extract(html))
+        found = sum(1 for snippet in label["content"] if snippet in text)
+        rejected = sum(1 for snippet in label["boilerplate"] if snippet not in text)
+
+        rows.append((name, found, len(label["content"]), rejected, len(label["boilerplate"])))
+        found_total += found
+        content_total += len(label["content"])
+        rejected_total += rejected
+        boilerplate_total += len(label["boilerplate"])
+
+    return rows, found_total / content_total, rejected_total / boilerplate_total
+
+def time_extraction(html: str, repeat: int) -> float:
+    """Average seconds per extraction, excluding BeautifulSoup construction"""
+    parser = HTMLParser(html, "https://example.com/")
+    loop = asyncio.new_event_loop()
+    try:
+        start = time.perf_counter()
+        for _ in range(repeat):
+            loop.run_until_complete(parser.extract_text_content())
+        return (time.perf_counter() - start) / repeat
+    finally:
+        loop.close()
+
+def scaled_page(html: str, factor: int) -> str:
+    """Repeat a page's body factor times to build a larger document"""
+    head, _, rest = html.partition("<body>")
+    body, _, tail = rest.partition("</body>")
+    return f"{head}<body>{body * factor}</body>{tail}"
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--repeat", type=int, default=200, help="extractions per timing sample")
+    args = arg_parser.parse_args()
+
+    corpus = load_corpus()
+
+    print("Accuracy")
+    rows, recall, rejection = score_accuracy(corpus)
+    for name, found, content, rejected, boilerplate in rows:
+        print(f"  {name:<22} content {found}/{content}  boilerplate rejected {rejected}/{boilerplate}")
+    print(f"  content recall: {recall:.1%}  boilerplate rejection: {rejection:.1%}")
+
+    print("\nThroughput (corpus)")
+    total_bytes = sum(len(html.encode("utf-8")) for _, html, _ in corpus)
+    seconds = sum(time_extraction(html, args.repeat) for _, html, _ in corpus)
+    print(f"  {len(corpus) / seconds:,.0f} pages/s  {total_bytes / seconds / 1e6:,.2f} MB/s")
+
+    print("\nScaling (news_article.html body repeated)")
+    base_html = next(html for name, html, _ in corpus if name == "news_article.html")
+    for factor in (1, 4, 16, 64):
+        html = scaled_page(base_html, factor)
+        size_kb = len(html.encode("utf-8")) / 1024
+        seconds = time_extraction(html, max(1, args.repeat // factor))
+        print(f"  x{factor:<3} {size_kb:8.1f} KB  {seconds * 1000:8.2f} ms  {seconds * 1e6 / size_kb:6.1f} us/KB")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+# ===========================
+# benchmarks/worker_scaling.py
+# ===========================
+"""
+Throughput of /api/scrape as the number of uvicorn workers grows.
+
+A local origin server serves the pages in benchmarks/corpus/text, and for
+each worker count the app is started with `uvicorn --workers N` against a
+scratch data directory. Client processes then post scrapes for a fixed
+duration. Besides requests per second and scaling efficiency (throughput
+divided by N times the single-worker throughput), the run checks that the
+shared scrape counters in /api/stats add up to the requests served, i.e.
+that all workers agree on one set of numbers.
+
+Per-host rate limiting is turned off, since every request goes to the
+same local origin.
+
+Usage:
+    python benchmarks/worker_scaling.py [--workers 1,2,4] [--duration 10]
+        [--concurrency 8] [--clients N]
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import httpx
+
+ROOT = Path(__file__).resolve().parent.parent
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus" / "text"
+PAGES = sorted(path.name for path in CORPUS_DIR.glob("*.html"))
+OPTIONS = ["text", "links", "headings", "meta"]
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        pass
+
+def serve_origin(port: int):
+    handler = partial(QuietHandler, directory=str(CORPUS_DIR))
+    ThreadingHTTPServer(("127.0.0.1", port), handler).serve_forever()
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def wait_until_up(url: str, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(url, timeout=1.0).status_code == 200:
+                return
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    raise RuntimeError(f"{url} did not come up within {timeout}s")
+
+def start_app(port: int, workers: int, data_dir: Path) -> subprocess.Popen:
+    env = dict(
+        os.environ,
+        RATE_LIMIT_PER_MINUTE="0",
+        MAX_SCRAPES_PER_CLIENT="1000",
+        MAX_QUEUED_SCRAPES="1000",
+        DATA_DIR=str(data_dir),
+        SCRAPED_DIR=str(data_dir / "scraped"),
+        LOGS_DIR=str(data_dir / "logs"),
+        CACHE_DIR=str(data_dir / "cache"),
+        ARCHIVE_DIR=str(data_dir / "archive"),
+        SHARED_STATE_PATH=str(data_dir / "state.db"),
+    )
+    command = [
+        sys.executable, "-m", "uvicorn", "main:app",
+        "--host", "127.0.0.1", "--port", str(port),
+        "--workers", str(workers), "--log-level", "warning", "--no-access-log"
+    ]
+    process = subprocess.Popen(command, cwd=str(ROOT), env=env)
+    wait_until_up(f"http://127.0.0.1:{port}/api/health")
+    return process
+
+async def _generate_load(app_url: str, origin_url: str, duration: float, concurrency: int) -> int:
+    done = 0
+    deadline = time.monotonic() + duration
+
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        async def loop(offset: int):
+            nonlocal done
+            i = offset
+            while time.monotonic() < deadline:
+                page = PAGES[i % len(PAGES)]
+                response = await client.post(f"{app_url}/api/scrape", json={"url": f"{origin_url}/{page}", "options": OPTIONS})
+                if response.status_code == 200 and response.json()["success"]:
+                    done += 1
+                i += 1
+
+        await asyncio.gather(*(loop(i) for i in range(concurrency)))
+    return done
+
+def generate_load(args) -> int:
+    return asyncio.run(_generate_load(*args))
+
+def measure(workers: int, origin_url: str, duration: float, concurrency: int, clients: int) -> dict:
+    port = free_port()
+    app_url = f"http://127.0.0.1:{port}"
+
+    with tempfile.TemporaryDirectory() as tmp:
+        process = start_app(port, workers, Path(tmp))
+        try:
+            # Warm up every worker (imports, first parse) before timing
+            asyncio.run(_generate_load(app_url, origin_url, 1.0, concurrency))
+            time.sleep(2.0)
+            before = httpx.get(f"{app_url}/api/stats").json()["counters"].get("scrapes_succeeded", 0)
+
+            started = time.perf_counter()
+            with multiprocessing.Pool(clients) as pool:
+                done = sum(pool.map(generate_load, [(app_url, origin_url, duration, concurrency)] * clients))
+            elapsed = time.perf_counter() - started
+
+            # Give every worker a flush interval to publish its counters
+            time.sleep(2.0)
+            stats = httpx.get(f"{app_url}/api/stats").json()
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    return {
+        "workers": workers,
+        "requests": done,
+        "rps": done / elapsed,
+        "counted": stats["counters"].get("scrapes_succeeded", 0) - before,
+        "workers_reporting": len(stats["workers"])
+    }
+
+def main():
+    cpus = os.cpu_count() or 1
+    arg_parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    arg_parser.add_argument("--workers", default=",".join(str(n) for n in (1, 2, 4, 8) if n <= cpus) or "1",
+                            help="comma-separated worker counts")
+    arg_parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    arg_parser.add_argument("--concurrency", type=int, default=8, help="in-flight requests per client process")
+    arg_parser.add_argument("--clients", type=int, default=max(1, cpus // 2), help="load generator processes")
+    args = arg_parser.parse_args()
+
+    origin_port = free_port()
+    origin = multiprocessing.Process(target=serve_origin, args=(origin_port,), daemon=True)
+    origin.start()
+    origin_url = f"http://127.0.0.1:{origin_port}"
+    wait_until_up(f"{origin_url}/{PAGES[0]}")
+
+    print(f"{cpus} CPUs, {args.clients} client processes x {args.concurrency} concurrent requests, "
+          f"{args.duration:.0f}s per run\n")
+    print(f"{'workers':>8} {'req/s':>9} {'speedup':>8} {'efficiency':>11} {'counted':>14} {'reporting':>10}")
+
+    baseline = None
+    try:
+        for workers in (int(n) for n in args.workers.split(",")):
+            result = measure(workers, origin_url, args.duration, args.concurrency, args.clients)
+            baseline = baseline or result["rps"] / workers
+            speedup = result["rps"] / baseline
+            print(f"{workers:>8} {result['rps']:>9.1f} {speedup:>7.2f}x {speedup / workers:>10.0%} "
+                  f"{result['counted']:>6}/{result['requests']:<7} {result['workers_reporting']:>10}")
+    finally:
+        origin.terminate()
+
+if __name__ == "__main__":
+    main()
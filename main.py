@@ -1,18 +1,19 @@
 # ===========================
 # main.py
 # ===========================
-import uvicorn
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+import asyncio
 import os
 from dotenv import load_dotenv
 
-from app.api.routes import router as api_router
+from app.api.routes import router as api_router, process_metrics
+from app.core.browser import browser_pool
 from app.core.config import settings
-from app.utils.setup import create_directories, setup_logging
+from app.core.shared_state import shared_state
+from app.utils.setup import create_directories, setup_logging, warm_up
 
 load_dotenv()
 
@@ -22,9 +23,19 @@ async def lifespan(app: FastAPI):
     # Startup
     create_directories()
     setup_logging()
+    if settings.js_render_enabled:
+        await browser_pool.start()
+    publisher = asyncio.create_task(shared_state.publish_forever(process_metrics))
+    warming = asyncio.create_task(warm_up()) if settings.warm_up_on_startup else None
     yield
     # Shutdown
-    pass
+    for task in (publisher, warming):
+        if task is not None:
+            task.cancel()
+            with suppress(asyncio.CancelledError):
+                await task
+    await browser_pool.close()
+    await asyncio.to_thread(shared_state.retire)
 
 # Create FastAPI app
 app = FastAPI(
@@ -48,9 +59,6 @@ app.add_middleware(
 # Mount static files
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
 
-# Setup templates
-templates = Jinja2Templates(directory="app/templates")
-
 # Include API routes
 app.include_router(api_router, prefix="/api")
 
@@ -59,6 +67,7 @@ from app.routes import router as main_router
 app.include_router(main_router)
 
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(
         "main:app",
         host="127.0.0.1",
@@ -0,0 +1,151 @@
+# ===========================
+# tests/test_admission.py
+# ===========================
+
+import asyncio
+import pytest
+from app.core.admission import AdmissionController, record_response_bytes, sleep_outside_slot
+from app.core.exceptions import ServiceOverloadedException, TooManyRequestsException
+
+def make_controller(**overrides):
+    options = dict(
+        max_concurrent=1,
+        min_concurrent=1,
+        max_queue=2,
+        max_per_client=2,
+        max_inflight_bytes=1000,
+        queue_timeout=1.0,
+        target_latency=5.0
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+class TestAdmissionController:
+    @pytest.mark.asyncio
+    async def test_sheds_when_queue_full(self):
+        controller = make_controller(max_queue=0)
+        
+        async with controller.slot('a'):
+            with pytest.raises(ServiceOverloadedException) as exc_info:
+                await controller.acquire('b')
+        
+        assert exc_info.value.status_code == 503
+        assert exc_info.value.retry_after >= 1
+        assert controller.stats()['shed']['queue_full'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_per_client_limit(self):
+        controller = make_controller(max_concurrent=4, max_per_client=1)
+        
+        async with controller.slot('a'):
+            with pytest.raises(TooManyRequestsException) as exc_info:
+                await controller.acquire('a')
+            
+            # Other clients are unaffected
+            slot = await controller.acquire('b')
+            slot.release()
+        
+        assert exc_info.value.status_code == 429
+    
+    @pytest.mark.asyncio
+    async def test_queue_prefers_lighter_clients(self):
+        controller = make_controller(max_queue=4, max_per_client=4)
+        order = []
+        
+        async def scrape(client_id):
+            async with controller.slot(client_id):
+                order.append(client_id)
+        
+        holder = await controller.acquire('busy')
+        busy = asyncio.create_task(scrape('busy'))
+        await asyncio.sleep(0)
+        idle = asyncio.create_task(scrape('idle'))
+        await asyncio.sleep(0)
+        
+        assert controller.stats()['queue_depth'] == 2
+        holder.release()
+        await asyncio.gather(busy, idle)
+        
+        assert order == ['idle', 'busy']
+    
+    @pytest.mark.asyncio
+    async def test_queue_timeout_and_inflight_bytes(self):
+        controller = make_controller(max_concurrent=4, max_inflight_bytes=100, queue_timeout=0.01)
+        
+        async with controller.slot('a'):
+            record_response_bytes(150)
+            assert controller.stats()['inflight_bytes'] == 150
+            
+            with pytest.raises(ServiceOverloadedException):
+                await controller.acquire('b')
+        
+        stats = controller.stats()
+        assert stats['inflight_bytes'] == 0
+        assert stats['queue_depth'] == 0
+        assert stats['shed']['queue_timeout'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_limit_adapts_to_latency(self):
+        controller = make_controller(max_concurrent=8, target_latency=0.0)
+        
+        slot = await controller.acquire('a')
+        await asyncio.sleep(0.01)
+        slot.release()
+        
+        assert controller.stats()['concurrency_limit'] == 6
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_waits_do_not_count_as_latency(self):
+        controller = make_controller(max_concurrent=8, target_latency=0.05)
+        
+        async with controller.slot('a'):
+            await sleep_outside_slot(0.1)
+        
+        assert controller.stats()['latency_avg_seconds'] < 0.05
+        assert controller.stats()['concurrency_limit'] == 8
+    
+    @pytest.mark.asyncio
+    async def test_rate_limit_waits_lend_out_the_slot(self):
+        controller = make_controller(max_queue=0)
+        resumed = asyncio.Event()
+        
+        async def rate_limited_scrape():
+            async with controller.slot('a'):
+                await sleep_outside_slot(0.05)
+                resumed.set()
+                assert controller.stats()['active'] == 1
+        
+        waiting = asyncio.create_task(rate_limited_scrape())
+        await asyncio.sleep(0.01)
+        
+        # Another client gets the only slot while the first one waits...
+        other = await controller.acquire('b')
+        await asyncio.sleep(0.1)
+        assert not resumed.is_set()
+        
+        # ...and the waiting scrape takes it back, without being shed, when it is freed
+        other.release()
+        await waiting
+        stats = controller.stats()
+        assert stats['active'] == 0
+        assert stats['queue_depth'] == 0
+        assert stats['shed_total'] == 0
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_while_lent_out(self):
+        controller = make_controller()
+        
+        async def rate_limited_scrape():
+            async with controller.slot('a'):
+                await sleep_outside_slot(10)
+        
+        waiting = asyncio.create_task(rate_limited_scrape())
+        await asyncio.sleep(0.01)
+        waiting.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting
+        
+        assert controller.stats()['active'] == 0
+        slot = await controller.acquire('a')
+        assert controller.stats()['active'] == 1
+        slot.release()
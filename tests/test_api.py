@@ -4,6 +4,7 @@
 
 import pytest
 import httpx
+from unittest.mock import patch
 from fastapi.testclient import TestClient
 from main import app
 from app.models.schemas import ScrapingOption
@@ -48,14 +49,86 @@ class TestAPI:
         response = client.post("/api/scrape", json=request_data)
         assert response.status_code == 422  # Validation error
 
+    def test_scrape_stream_invalid_url(self):
+        request_data = {
+            "url": "not-a-valid-url",
+            "options": ["text"]
+        }
+        
+        response = client.post("/api/scrape/stream", json=request_data)
+        assert response.status_code == 422  # Validation error
+
+    def test_scrape_stream_content_type(self):
+        request_data = {
+            "url": "https://httpbin.org/html",
+            "options": ["headings"]
+        }
+        
+        response = client.post("/api/scrape/stream", json=request_data)
+        assert response.status_code == 200
+        assert "text/event-stream" in response.headers["content-type"]
+        assert "event: complete" in response.text
+
+    def test_scrape_batch_empty_urls(self):
+        request_data = {
+            "urls": [],
+            "options": ["text"]
+        }
+        
+        response = client.post("/api/scrape/batch", json=request_data)
+        assert response.status_code == 422  # Validation error
+
     def test_stats_endpoint(self):
         response = client.get("/api/stats")
         assert response.status_code == 200
         data = response.json()
         assert "total_scrapes" in data
         assert "status" in data
+        assert "queue_depth" in data["admission"]
+        assert "hit_rate" in data["dns"]
+        assert str(data["worker_pid"]) in data["workers"]
+        assert isinstance(data["counters"], dict)
+
+    def test_link_queries_for_unknown_url(self):
+        response = client.get("/api/links/in", params={"url": "https://never-scraped.invalid/"})
+        assert response.status_code == 404
+
+    def test_latest_result_not_found(self):
+        response = client.get("/api/results/latest", params={"url": "https://never-scraped.invalid/"})
+        assert response.status_code == 404
+
+    def test_profile_requires_admin_token(self):
+        response = client.get("/api/admin/profile")
+        assert response.status_code == 404  # Disabled without ADMIN_TOKEN
+        
+        with patch("app.api.routes.settings.admin_token", "secret"):
+            response = client.get("/api/admin/profile", headers={"X-Admin-Token": "wrong"})
+            assert response.status_code == 403
+            
+            response = client.get(
+                "/api/admin/profile",
+                params={"seconds": 0.05, "format": "json"},
+                headers={"X-Admin-Token": "secret"}
+            )
+            assert response.status_code == 200
+            assert "stages" in response.json()
 
     def test_home_page(self):
         response = client.get("/")
         assert response.status_code == 200
         assert "text/html" in response.headers["content-type"]
+
+    def test_docs_page(self):
+        response = client.get("/docs-page")
+        assert response.status_code == 200
+        assert "/api/scrape" in response.text
+
+    def test_forwarded_for_ignored_from_untrusted_peer(self):
+        from starlette.requests import Request
+        from app.api.routes import client_identifier
+        request = Request({
+            "type": "http",
+            "headers": [(b"x-forwarded-for", b"203.0.113.7")],
+            "client": ("198.51.100.2", 50000)
+        })
+        assert client_identifier(request) == "198.51.100.2"
@@ -0,0 +1,89 @@
+# ===========================
+# tests/test_archive.py
+# ===========================
+
+import json
+import pytest
+from unittest.mock import patch
+from app.core.archive import ResponseArchive
+from app.core.scraper import WebScraper
+from app.cli.bulk_parse import run
+from app.models.schemas import ScrapingOption
+
+PAGE = "<html><body><h1>{title}</h1></body></html>"
+
+def archive_pages(archive, count):
+    for i in range(count):
+        archive.write(
+            f'https://example.com/{i}',
+            200,
+            'OK',
+            {'Content-Type': 'text/html; charset=utf-8'},
+            PAGE.format(title=f'Page {i}').encode('utf-8')
+        )
+
+class TestResponseArchive:
+    def test_write_and_load(self, tmp_path):
+        archive = ResponseArchive(str(tmp_path))
+        archive_pages(archive, 3)
+        
+        status, headers, body = archive.load('https://example.com/1')
+        assert status == 200
+        assert headers['content-type'] == 'text/html; charset=utf-8'
+        assert body == PAGE.format(title='Page 1').encode('utf-8')
+        assert archive.load('https://example.com/missing') is None
+    
+    def test_rotation_keeps_index_valid(self, tmp_path):
+        archive = ResponseArchive(str(tmp_path), max_file_bytes=200)
+        archive_pages(archive, 4)
+        
+        assert len(archive.warc_files()) > 1
+        
+        # A fresh instance rebuilds its view from the on-disk index
+        reader = ResponseArchive(str(tmp_path))
+        for i in range(4):
+            _, _, body = reader.load(f'https://example.com/{i}')
+            assert f'Page {i}'.encode('utf-8') in body
+    
+    def test_legacy_index_is_imported(self, tmp_path):
+        # Write an archive, then swap its index for the old tab-separated one
+        archive = ResponseArchive(str(tmp_path))
+        archive_pages(archive, 2)
+        entries = [archive.lookup(f'https://example.com/{i}') for i in range(2)]
+        archive.close()
+        for path in tmp_path.glob('index.db*'):
+            path.unlink()
+        (tmp_path / 'index.tsv').write_text(''.join(
+            f"{e.url}\t{e.timestamp}\t{e.filename}\t{e.offset}\t{e.length}\n" for e in entries
+        ) + "https://example.com/partial\t2024", encoding='utf-8')
+        
+        reader = ResponseArchive(str(tmp_path))
+        _, _, body = reader.load('https://example.com/1')
+        assert b'Page 1' in body
+        assert reader.lookup('https://example.com/partial') is None
+        assert not (tmp_path / 'index.tsv').exists()
+    
+    @pytest.mark.asyncio
+    async def test_replay_without_network(self, tmp_path):
+        archive = ResponseArchive(str(tmp_path))
+        archive_pages(archive, 1)
+        
+        with patch('app.core.scraper.response_archive', archive), patch('httpx.AsyncClient') as mock_client:
+            scraper = WebScraper()
+            result = await scraper.replay('https://example.com/0', [ScrapingOption.HEADINGS])
+            missing = await scraper.replay('https://example.com/9', [ScrapingOption.HEADINGS])
+        
+        mock_client.assert_not_called()
+        assert result.success is True
+        assert result.data.headings == {'h1': ['Page 0']}
+        assert missing.success is False
+    
+    def test_bulk_replay_over_archive(self, tmp_path):
+        archive = ResponseArchive(str(tmp_path / 'archive'))
+        archive_pages(archive, 3)
+        output = tmp_path / 'replayed.ndjson'
+        
+        run(archive.warc_files(), [ScrapingOption.HEADINGS], output=output, workers=1)
+        
+        rows = [json.loads(line) for line in output.read_text(encoding='utf-8').splitlines()]
+        assert sorted(row['url'] for row in rows) == [f'https://example.com/{i}' for i in range(3)]
@@ -0,0 +1,138 @@
+# ===========================
+# tests/test_browser.py
+# ===========================
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from app.core.browser import BrowserPool, BrowserSession
+from app.core.scraper import WebScraper
+from app.models.schemas import ScrapingOption, RenderOptions
+
+class StandInSession(BrowserSession):
+    """Local stand-in for a headless browser that 'renders' a fixed script"""
+    def __init__(self):
+        super().__init__()
+        self.healthy = True
+        self.closed = False
+        self.calls = []
+    
+    def render(self, url, wait_until='load', wait_for_selector=None, timeout=30):
+        self.calls.append((url, wait_until, wait_for_selector))
+        return f"<html><body><h1>Rendered {url}</h1></body></html>"
+    
+    def is_healthy(self):
+        return self.healthy
+    
+    def close(self):
+        self.closed = True
+
+class TestBrowserPool:
+    def test_session_must_implement_render(self):
+        class Incomplete(BrowserSession):
+            pass
+        
+        with pytest.raises(TypeError):
+            Incomplete()
+    
+    @pytest.mark.asyncio
+    async def test_warm_sessions_are_reused(self):
+        pool = BrowserPool(size=2, max_pages=10, session_factory=StandInSession)
+        await pool.start()
+        
+        for _ in range(5):
+            await pool.render('https://example.com')
+        
+        stats = pool.stats()
+        assert stats['created'] == 2
+        assert stats['idle'] == 2
+        await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_recycles_after_max_pages(self):
+        pool = BrowserPool(size=1, max_pages=2, session_factory=StandInSession)
+        
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            pass
+        assert first is second
+        assert second.closed
+        
+        # The replacement is started in the background
+        await asyncio.sleep(0.05)
+        async with pool.lease() as third:
+            assert third is not second
+        assert pool.stats()['recycled'] == 1
+        await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_unhealthy_sessions_are_replaced(self):
+        pool = BrowserPool(size=1, max_pages=10, session_factory=StandInSession)
+        await pool.start()
+        
+        async with pool.lease() as session:
+            session.healthy = False
+        async with pool.lease() as replacement:
+            assert replacement is not session
+        
+        assert session.closed
+        assert pool.stats()['unhealthy'] == 1
+        await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_render_is_not_reused(self):
+        started, release = threading.Event(), threading.Event()
+        sessions = []
+        
+        class SlowSession(StandInSession):
+            def __init__(self):
+                super().__init__()
+                sessions.append(self)
+            
+            def render(self, url, wait_until='load', wait_for_selector=None, timeout=30):
+                started.set()
+                release.wait(5)
+                return super().render(url, wait_until, wait_for_selector, timeout)
+        
+        pool = BrowserPool(size=1, max_pages=10, session_factory=SlowSession)
+        await pool.start()
+        
+        task = asyncio.create_task(pool.render('https://example.com/slow'))
+        await asyncio.to_thread(started.wait, 5)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        
+        # The worker thread is still rendering in the first session
+        async with pool.lease() as session:
+            assert session is not sessions[0]
+        release.set()
+        
+        await asyncio.sleep(0.05)
+        assert sessions[0].closed
+        assert pool.stats()['failed'] == 1
+        await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_scrape_with_render_js(self):
+        pool = BrowserPool(size=1, max_pages=10, session_factory=StandInSession)
+        render = RenderOptions(wait_for_selector='#app')
+        
+        with patch('app.core.scraper.browser_pool', pool), \
+             patch('app.core.scraper.settings.js_render_enabled', True), \
+             patch('httpx.AsyncClient') as mock_client:
+            result = await WebScraper().scrape('https://example.com', [ScrapingOption.HEADINGS], render,
+                                               respect_robots=False)
+        
+        mock_client.assert_not_called()
+        assert result.success is True
+        assert result.data.headings == {'h1': ['Rendered https://example.com']}
+        await pool.close()
+    
+    @pytest.mark.asyncio
+    async def test_render_js_disabled(self):
+        result = await WebScraper().scrape('https://example.com', [ScrapingOption.TEXT], RenderOptions())
+        assert result.success is False
+        assert 'not enabled' in result.error
@@ -0,0 +1,100 @@
+# ===========================
+# tests/test_bulk_parse.py
+# ===========================
+
+import gzip
+import json
+from app.cli.bulk_parse import run
+from app.models.schemas import ScrapingOption
+
+PAGE = "<html><head><title>{title}</title></head><body><h1>{title}</h1><a href='/next'>Next</a></body></html>"
+
+def write_warc(path, pages, http_headers="", encode=None):
+    with gzip.open(path, 'wb') as f:
+        for i, (url, html) in enumerate(pages):
+            body = html.encode('utf-8')
+            if encode is not None:
+                body = encode(body)
+            block = (
+                f"HTTP/1.1 200 OK\r\nContent-Type: text/html; charset=utf-8\r\n{http_headers}\r\n".encode('utf-8')
+                + body
+            )
+            headers = (
+                f"WARC/1.0\r\nWARC-Type: response\r\nWARC-Record-ID: <urn:uuid:{i}>\r\n"
+                f"WARC-Target-URI: {url}\r\nContent-Length: {len(block)}\r\n\r\n"
+            )
+            f.write(headers.encode('utf-8') + block + b"\r\n\r\n")
+
+def read_ndjson(path):
+    return [json.loads(line) for line in path.read_text(encoding='utf-8').splitlines()]
+
+class TestBulkParse:
+    def test_directory_run_resumes(self, tmp_path):
+        pages = tmp_path / 'pages'
+        pages.mkdir()
+        (pages / 'a.html').write_text(PAGE.format(title='Alpha'), encoding='utf-8')
+        (pages / 'b.html').write_text(PAGE.format(title='Beta'), encoding='utf-8')
+        output = tmp_path / 'results.ndjson'
+        
+        progress = run([pages], [ScrapingOption.HEADINGS], output=output, workers=1, base_url='https://example.com')
+        assert progress.processed == 2
+        
+        (pages / 'c.html').write_text(PAGE.format(title='Gamma'), encoding='utf-8')
+        progress = run([pages], [ScrapingOption.HEADINGS], output=output, workers=1, base_url='https://example.com')
+        assert progress.processed == 1
+        assert progress.skipped == 2
+        
+        results = {row['url']: row for row in read_ndjson(output)}
+        assert set(results) == {f'https://example.com/{name}.html' for name in 'abc'}
+        assert results['https://example.com/c.html']['data']['headings'] == {'h1': ['Gamma']}
+    
+    def test_sources_with_same_relative_paths(self, tmp_path):
+        output = tmp_path / 'results.ndjson'
+        for name in ('first', 'second'):
+            pages = tmp_path / name
+            pages.mkdir()
+            (pages / 'index.html').write_text(PAGE.format(title=name), encoding='utf-8')
+            progress = run([pages], [ScrapingOption.HEADINGS], output=output, workers=1)
+            assert progress.processed == 1
+            assert progress.skipped == 0
+        
+        headings = sorted(row['data']['headings']['h1'][0] for row in read_ndjson(output))
+        assert headings == ['first', 'second']
+    
+    def test_warc_source(self, tmp_path):
+        warc = tmp_path / 'crawl.warc.gz'
+        write_warc(warc, [
+            ('https://example.com/one', PAGE.format(title='One')),
+            ('https://example.com/two', PAGE.format(title='Two'))
+        ])
+        output = tmp_path / 'results.ndjson'
+        
+        run([warc], [ScrapingOption.LINKS], output=output, workers=2, chunksize=1)
+        
+        results = sorted(read_ndjson(output), key=lambda row: row['url'])
+        assert [row['url'] for row in results] == ['https://example.com/one', 'https://example.com/two']
+        assert results[0]['data']['links'][0]['absolute_url'] == 'https://example.com/next'
+    
+    def test_warc_encoded_payloads(self, tmp_path):
+        def gzip_chunked(body):
+            compressed = gzip.compress(body)
+            middle = len(compressed) // 2
+            chunks = [compressed[:middle], compressed[middle:]]
+            return b''.join(b"%x\r\n%s\r\n" % (len(chunk), chunk) for chunk in chunks) + b"0\r\n\r\n"
+        
+        encoded = tmp_path / 'encoded.warc.gz'
+        write_warc(encoded, [('https://example.com/one', PAGE.format(title='One'))],
+                   http_headers="Content-Encoding: gzip\r\nTransfer-Encoding: chunked\r\n", encode=gzip_chunked)
+        unsupported = tmp_path / 'unsupported.warc.gz'
+        write_warc(unsupported, [('https://example.com/two', PAGE.format(title='Two'))],
+                   http_headers="Content-Encoding: br\r\n")
+        output = tmp_path / 'results.ndjson'
+        
+        progress = run([encoded, unsupported], [ScrapingOption.LINKS], output=output, workers=1)
+        
+        results = sorted(read_ndjson(output), key=lambda row: row['url'])
+        assert results[0]['success'] is True
+        assert results[0]['data']['links'][0]['absolute_url'] == 'https://example.com/next'
+        assert results[1]['success'] is False
+        assert 'Unsupported Content-Encoding: br' in results[1]['error']
+        assert progress.failed == 1
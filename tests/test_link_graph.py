@@ -0,0 +1,93 @@
+# ===========================
+# tests/test_link_graph.py
+# ===========================
+
+import pytest
+from app.core.link_graph import LinkGraph
+
+def build_graph(directory, compact_after=1000):
+    graph = LinkGraph(str(directory), compact_after=compact_after)
+    graph.add_page('https://a.com/', ['https://b.com/', 'https://c.com/#top', 'mailto:me@a.com', 'https://b.com/'])
+    graph.add_page('https://b.com/', ['https://c.com/'])
+    return graph
+
+def links(result):
+    return result["links"] if result else None
+
+class TestLinkGraph:
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_out_and_in_links(self, tmp_path, compact):
+        graph = build_graph(tmp_path)
+        if compact:
+            assert graph.compact()
+        
+        assert links(graph.out_links('https://a.com/')) == ['https://b.com/', 'https://c.com/']
+        assert links(graph.in_links('https://c.com/')) == ['https://a.com/', 'https://b.com/']
+        assert graph.degree('https://c.com/') == {"url": 'https://c.com/', "in": 2, "out": 0}
+        assert graph.out_links('https://unknown.com/') is None
+    
+    def test_resaving_a_page_replaces_its_compacted_links(self, tmp_path):
+        graph = build_graph(tmp_path)
+        graph.compact()
+        
+        graph.add_page('https://a.com/', ['https://d.com/'])
+        assert links(graph.out_links('https://a.com/')) == ['https://d.com/']
+        assert links(graph.in_links('https://c.com/')) == ['https://b.com/']
+        assert links(graph.in_links('https://d.com/')) == ['https://a.com/']
+        
+        graph.compact()
+        assert links(graph.in_links('https://c.com/')) == ['https://b.com/']
+        assert graph.stats()["compacted_edges"] == 2
+    
+    def test_compacted_graph_is_visible_to_other_instances(self, tmp_path):
+        build_graph(tmp_path).compact()
+        
+        reopened = LinkGraph(str(tmp_path))
+        assert reopened.stats()["generation"] == 1
+        assert links(reopened.in_links('https://c.com/')) == ['https://a.com/', 'https://b.com/']
+    
+    def test_add_page_reports_when_compaction_is_due(self, tmp_path):
+        graph = LinkGraph(str(tmp_path), compact_after=2)
+        assert not graph.add_page('https://a.com/', [])
+        assert graph.add_page('https://b.com/', [])
+        
+        graph.compact()
+        assert not graph.add_page('https://c.com/', [])
+    
+    def test_only_one_compaction_at_a_time(self, tmp_path):
+        graph = build_graph(tmp_path)
+        other = LinkGraph(str(tmp_path))
+        
+        with other._compaction_lock() as acquired:
+            assert acquired
+            assert graph.compacting()
+            assert not graph.compact()
+        
+        assert not graph.compacting()
+        assert graph.compact()
+    
+    def test_compaction_cli(self, tmp_path):
+        from app.cli.compact_links import main
+        build_graph(tmp_path)
+        
+        assert main(['--dir', str(tmp_path)]) == 0
+        assert LinkGraph(str(tmp_path)).stats()["generation"] == 1
+    
+    def test_pagination(self, tmp_path):
+        graph = LinkGraph(str(tmp_path))
+        graph.add_page('https://hub.com/', [f'https://hub.com/{i}' for i in range(10)])
+        
+        page = graph.out_links('https://hub.com/', limit=3, offset=6)
+        assert page["total"] == 10
+        assert page["links"] == ['https://hub.com/6', 'https://hub.com/7', 'https://hub.com/8']
+    
+    def test_broken_links(self, tmp_path):
+        graph = build_graph(tmp_path)
+        graph.mark_status('https://c.com/', False, 'HTTP error 404')
+        
+        assert graph.broken_links('https://a.com/') == [{"url": 'https://c.com/', "error": 'HTTP error 404'}]
+        assert graph.broken_links() == [{"url": 'https://c.com/', "error": 'HTTP error 404', "linked_from": 2}]
+        
+        # A later successful scrape clears it
+        graph.add_page('https://c.com/', [])
+        assert graph.broken_links() == []
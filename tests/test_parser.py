@@ -0,0 +1,71 @@
+# ===========================
+# tests/test_parser.py
+# ===========================
+
+import pytest
+from app.core.parser import HTMLParser
+
+ARTICLE_HTML = """
+<html>
+    <body>
+        <nav><a href="/home">Home</a> <a href="/about">About us</a></nav>
+        <article>
+            <p>The committee published its findings after reviewing more than two hundred submissions from the public.</p>
+            <div class="share"><a href="/share">Share this story with your friends and family</a></div>
+        </article>
+        <div class="sidebar"><p>Sponsored stories that you might also enjoy reading this weekend.</p></div>
+        <footer><p>Copyright notice and legal information for this website.</p></footer>
+    </body>
+</html>
+"""
+
+class TestHTMLParser:
+    @pytest.mark.asyncio
+    async def test_text_content_skips_boilerplate(self):
+        parser = HTMLParser(ARTICLE_HTML, 'https://example.com')
+        text_content = await parser.extract_text_content()
+        
+        assert len(text_content) == 1
+        assert text_content[0].startswith('The committee published')
+    
+    @pytest.mark.asyncio
+    async def test_text_content_does_not_mutate_soup(self):
+        parser = HTMLParser(ARTICLE_HTML, 'https://example.com')
+        await parser.extract_text_content()
+        
+        links = await parser.extract_links()
+        assert {link.href for link in links} == {'/home', '/about', '/share'}
+    
+    @pytest.mark.asyncio
+    async def test_text_content_falls_back_to_paragraphs(self):
+        html = "<html><body><p>A short page with one brief line.</p></body></html>"
+        parser = HTMLParser(html, 'https://example.com')
+        
+        assert await parser.extract_text_content() == ['A short page with one brief line.']
+    
+    @pytest.mark.asyncio
+    async def test_content_inside_a_negatively_hinted_wrapper(self):
+        html = """
+        <html><body>
+            <div class="site-content has-sidebar">
+                <article>
+                    <p>The council approved the new cycling lanes after a long debate about parking and safety on the high street.</p>
+                    <p>Work on the first section is due to start in the spring and should take about three months to complete.</p>
+                </article>
+                <div class="sidebar"><p>Popular this week across all of our local news sections.</p></div>
+            </div>
+        </body></html>
+        """
+        parser = HTMLParser(html, 'https://example.com')
+        text_content = await parser.extract_text_content()
+        
+        assert len(text_content) == 2
+        assert text_content[0].startswith('The council approved')
+        assert text_content[1].startswith('Work on the first section')
+    
+    @pytest.mark.asyncio
+    async def test_fallback_ignores_hints_on_ancestors(self):
+        html = '<html><body><div class="has-sidebar"><p>A short page with one brief line.</p></div></body></html>'
+        parser = HTMLParser(html, 'https://example.com')
+        
+        assert await parser.extract_text_content() == ['A short page with one brief line.']
@@ -0,0 +1,63 @@
+# ===========================
+# tests/test_profiler.py
+# ===========================
+
+import asyncio
+import time
+import pytest
+from app.core.profiler import SamplingProfiler, ProfilerBusyError
+
+def busy_wait(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+class TestSamplingProfiler:
+    def test_stage_is_noop_when_inactive(self):
+        profiler = SamplingProfiler()
+        assert profiler.stage('fetch') is profiler.stage('parse')
+    
+    @pytest.mark.asyncio
+    async def test_samples_are_tagged_by_stage(self):
+        profiler = SamplingProfiler()
+        
+        async def workload():
+            await asyncio.sleep(0.02)
+            for _ in range(5):
+                with profiler.stage('parse'):
+                    busy_wait(0.02)
+                await asyncio.sleep(0)
+        
+        task = asyncio.create_task(workload())
+        report = await profiler.profile(seconds=0.3, interval=0.002)
+        await task
+        
+        assert report['stages']['parse']['calls'] == 5
+        assert report['stages']['parse']['samples'] > 0
+        assert any(line.startswith('stage:parse;') and 'busy_wait' in line for line in report['collapsed'])
+    
+    @pytest.mark.asyncio
+    async def test_request_bounded_profile(self):
+        profiler = SamplingProfiler()
+        
+        async def finish_requests():
+            await asyncio.sleep(0.02)
+            for _ in range(3):
+                profiler.request_finished()
+        
+        asyncio.create_task(finish_requests())
+        started = time.perf_counter()
+        report = await profiler.profile(requests=3)
+        
+        assert report['requests'] == 3
+        assert time.perf_counter() - started < 5
+    
+    @pytest.mark.asyncio
+    async def test_one_profile_at_a_time(self):
+        profiler = SamplingProfiler()
+        running = asyncio.create_task(profiler.profile(seconds=0.1))
+        await asyncio.sleep(0.01)
+        
+        with pytest.raises(ProfilerBusyError):
+            await profiler.profile(seconds=0.1)
+        await running
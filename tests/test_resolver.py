@@ -0,0 +1,125 @@
+# ===========================
+# tests/test_resolver.py
+# ===========================
+
+import asyncio
+import socket
+import time
+import pytest
+from types import SimpleNamespace
+from app.core.resolver import DNSCache
+
+class StubDNSCache(DNSCache):
+    """DNSCache with a canned resolver so tests never touch the network"""
+    def __init__(self, records, **kwargs):
+        super().__init__(**kwargs)
+        self.records = records
+        self.queries = []
+    
+    async def _query(self, host):
+        self.queries.append(host)
+        await asyncio.sleep(0)
+        if host not in self.records:
+            raise socket.gaierror(f"unknown host {host}")
+        return self.records[host]
+
+def make_cache(records, **overrides):
+    options = dict(max_entries=100, default_ttl=60, min_ttl=0, max_ttl=3600, negative_ttl=30)
+    options.update(overrides)
+    return StubDNSCache(records, **options)
+
+class TestDNSCache:
+    @pytest.mark.asyncio
+    async def test_caches_until_ttl_expires(self):
+        cache = make_cache({'example.com': (['93.184.216.34'], 0.05)})
+        
+        assert await cache.resolve('example.com') == ['93.184.216.34']
+        assert await cache.resolve('EXAMPLE.com') == ['93.184.216.34']
+        assert cache.queries == ['example.com']
+        
+        await asyncio.sleep(0.06)
+        await cache.resolve('example.com')
+        assert cache.queries == ['example.com', 'example.com']
+    
+    @pytest.mark.asyncio
+    async def test_negative_results_are_cached(self):
+        cache = make_cache({})
+        
+        for _ in range(3):
+            with pytest.raises(socket.gaierror):
+                await cache.resolve('missing.invalid')
+        
+        assert cache.queries == ['missing.invalid']
+        assert cache.stats()['negative_hits'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_prefetch_resolves_distinct_hosts_once(self):
+        cache = make_cache({'a.com': (['10.0.0.1'], 60), 'b.com': (['10.0.0.2'], 60)})
+        
+        resolved = await cache.prefetch(['a.com', 'b.com', 'a.com', 'c.invalid'])
+        await asyncio.gather(cache.resolve('a.com'), cache.resolve('b.com'))
+        
+        assert resolved == {'a.com': True, 'b.com': True, 'c.invalid': False}
+        assert sorted(cache.queries) == ['a.com', 'b.com', 'c.invalid']
+        assert cache.stats()['hits'] == 2
+    
+    @pytest.mark.asyncio
+    async def test_ip_literals_skip_lookup(self):
+        cache = make_cache({})
+        assert await cache.resolve('127.0.0.1') == ['127.0.0.1']
+        assert cache.queries == []
+    
+    @pytest.mark.asyncio
+    async def test_joiners_retry_when_owner_is_cancelled(self):
+        cache = make_cache({'example.com': (['93.184.216.34'], 60)})
+        release = asyncio.Event()
+        query = cache._query
+        
+        async def slow_first_query(host):
+            if not cache.queries:
+                cache.queries.append(host)
+                await release.wait()
+            return await query(host)
+        cache._query = slow_first_query
+        
+        owner = asyncio.create_task(cache.resolve('example.com'))
+        await asyncio.sleep(0)
+        joiner = asyncio.create_task(cache.resolve('example.com'))
+        await asyncio.sleep(0)
+        owner.cancel()
+        
+        assert await asyncio.wait_for(joiner, 1) == ['93.184.216.34']
+        assert owner.cancelled()
+        assert cache._pending == {}
+    
+    @pytest.mark.asyncio
+    async def test_hosts_file_names_resolve_with_dnspython(self, monkeypatch):
+        from app.core import resolver
+        
+        async def no_records(host, rdtype, lifetime=None):
+            raise LookupError(f"no {rdtype} records for {host}")
+        
+        monkeypatch.setattr(resolver, 'dns', SimpleNamespace(asyncresolver=SimpleNamespace(resolve=no_records)))
+        cache = DNSCache(max_entries=100, default_ttl=60, min_ttl=0, max_ttl=3600, negative_ttl=30)
+        
+        assert '127.0.0.1' in await cache.resolve('localhost')
+    
+    @pytest.mark.asyncio
+    async def test_record_ttl_is_looked_up_in_the_background(self, monkeypatch):
+        from app.core import resolver
+        answered = asyncio.Event()
+        
+        async def slow_records(host, rdtype, lifetime=None):
+            await answered.wait()
+            return SimpleNamespace(rrset=SimpleNamespace(ttl=5))
+        
+        monkeypatch.setattr(resolver, 'dns', SimpleNamespace(asyncresolver=SimpleNamespace(resolve=slow_records)))
+        cache = DNSCache(max_entries=100, default_ttl=60, min_ttl=0, max_ttl=3600, negative_ttl=30)
+        
+        # The addresses do not wait for the slow TTL query
+        assert '127.0.0.1' in await asyncio.wait_for(cache.resolve('localhost'), 1)
+        assert cache._entries['localhost'].expires_at > time.monotonic() + 50
+        
+        answered.set()
+        await asyncio.gather(*cache._refreshing)
+        assert cache._entries['localhost'].expires_at < time.monotonic() + 5
@@ -0,0 +1,189 @@
+# ===========================
+# tests/test_robots.py
+# ===========================
+
+import asyncio
+import httpx
+import pytest
+from unittest.mock import patch
+from app.core.robots import RobotsCache, parse_robots
+from app.core.scraper import WebScraper
+from app.models.schemas import ScrapingOption
+
+ROBOTS = """
+User-agent: *
+Disallow: /private/
+Allow: /private/public
+Disallow: /*.pdf$
+Disallow: /search?
+
+User-agent: WebScrapingTool
+User-agent: OtherBot
+Disallow: /tool-only/
+Crawl-delay: 5
+"""
+
+class StubRobotsCache(RobotsCache):
+    """RobotsCache with canned responses so tests never touch the network"""
+    def __init__(self, responses, **kwargs):
+        super().__init__(**kwargs)
+        self.responses = responses
+        self.requests = []
+    
+    async def _request(self, url, headers):
+        self.requests.append((url, headers))
+        await asyncio.sleep(0)
+        response = self.responses.pop(0) if len(self.responses) > 1 else self.responses[0]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+def make_cache(tmp_path, *responses, **overrides):
+    options = dict(directory=str(tmp_path), ttl=60, error_ttl=30, agent='WebScrapingTool')
+    options.update(overrides)
+    return StubRobotsCache(list(responses), **options)
+
+class TestRobotsRules:
+    def test_longest_match_wins_and_allow_wins_ties(self):
+        rules = parse_robots(ROBOTS, agent='crawler')
+        
+        assert rules.allowed('/')
+        assert not rules.allowed('/private/data')
+        assert rules.allowed('/private/public/page')
+        assert not rules.allowed('/files/report.pdf')
+        assert rules.allowed('/files/report.pdf?download=1')
+        assert not rules.allowed('/search?q=x')
+        assert rules.allowed('/robots.txt')
+        
+        tie = parse_robots("User-agent: *\nDisallow: /page\nAllow: /page\n")
+        assert tie.allowed('/page')
+    
+    def test_rules_longer_than_the_path_are_ignored(self):
+        rules = parse_robots("User-agent: *\nAllow: /ab*\nDisallow: /abc\nDisallow: /zzzzzzzzzz\n")
+        
+        assert rules.allowed('/abc')
+        assert not rules.allowed('/zzzzzzzzzz')
+    
+    def test_agent_specific_group_replaces_star(self):
+        rules = parse_robots(ROBOTS, agent='WebScrapingTool')
+        
+        assert not rules.allowed('/tool-only/x')
+        assert rules.allowed('/private/data')
+        assert rules.crawl_delay == 5
+        assert parse_robots(ROBOTS, agent='crawler').crawl_delay is None
+
+class TestRobotsCache:
+    @pytest.mark.asyncio
+    async def test_fetches_each_origin_once(self, tmp_path):
+        cache = make_cache(tmp_path, httpx.Response(200, text=ROBOTS))
+        
+        results = await asyncio.gather(*(cache.allowed(f'https://example.com/tool-only/{i}') for i in range(5)))
+        assert results == [False] * 5
+        assert await cache.allowed('https://EXAMPLE.com/other')
+        assert len(cache.requests) == 1
+        assert cache.crawl_delay('https://example.com/anything') == 5
+    
+    @pytest.mark.asyncio
+    async def test_waiters_survive_a_cancelled_fetch(self, tmp_path):
+        cache = make_cache(tmp_path, httpx.Response(200, text=ROBOTS))
+        started, release = asyncio.Event(), asyncio.Event()
+        request = cache._request
+        
+        async def slow_first_request(url, headers):
+            if not started.is_set():
+                started.set()
+                await release.wait()
+            return await request(url, headers)
+        cache._request = slow_first_request
+        
+        owner = asyncio.create_task(cache.allowed('https://example.com/tool-only/x'))
+        await started.wait()
+        waiter = asyncio.create_task(cache.allowed('https://example.com/tool-only/x'))
+        await asyncio.sleep(0)
+        owner.cancel()
+        
+        assert await asyncio.wait_for(waiter, 1) is False
+        assert owner.cancelled()
+    
+    @pytest.mark.asyncio
+    async def test_disk_cache_is_shared_between_instances(self, tmp_path):
+        await make_cache(tmp_path, httpx.Response(200, text=ROBOTS)).allowed('https://example.com/')
+        
+        other = make_cache(tmp_path, RuntimeError("should not fetch"))
+        assert not await other.allowed('https://example.com/tool-only/')
+        assert other.requests == []
+        assert other.stats()['disk_hits'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_revalidated(self, tmp_path):
+        cache = make_cache(
+            tmp_path,
+            httpx.Response(200, text=ROBOTS, headers={'ETag': '"v1"'}),
+            httpx.Response(304),
+            ttl=0
+        )
+        
+        assert not await cache.allowed('https://example.com/tool-only/')
+        assert not await cache.allowed('https://example.com/tool-only/')
+        
+        assert cache.requests[1][1] == {'If-None-Match': '"v1"'}
+        assert cache.stats()['revalidated'] == 1
+    
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("response, allowed", [
+        (httpx.Response(404), True),
+        (httpx.Response(503), False),
+        (httpx.ConnectError("unreachable"), False),
+        (httpx.ReadTimeout("timed out"), False),
+    ])
+    async def test_missing_or_failing_robots(self, tmp_path, response, allowed):
+        cache = make_cache(tmp_path, response)
+        assert await cache.allowed('https://example.com/page') is allowed
+    
+    @pytest.mark.asyncio
+    async def test_unreachable_robots_keeps_known_rules(self, tmp_path):
+        cache = make_cache(tmp_path, httpx.Response(200, text=ROBOTS), httpx.ConnectError("unreachable"), ttl=0)
+        assert await cache.allowed('https://example.com/page')
+        
+        # The refetch fails, so the rules fetched before still apply
+        assert await cache.allowed('https://example.com/page')
+        assert not await cache.allowed('https://example.com/tool-only/')
+        assert cache.stats()['errors'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_robots_is_fetched_with_the_product_token(self, tmp_path):
+        seen = []
+        
+        def handler(request):
+            seen.append(request.headers['user-agent'])
+            return httpx.Response(404)
+        
+        cache = RobotsCache(directory=str(tmp_path), agent='WebScrapingTool')
+        with patch('app.core.transport.create_transport', return_value=httpx.MockTransport(handler)):
+            assert await cache.allowed('https://example.com/page')
+        
+        assert 'WebScrapingTool' in seen[0]
+
+class TestRobotsEnforcement:
+    @pytest.mark.asyncio
+    async def test_disallowed_url_is_not_fetched(self, tmp_path):
+        cache = make_cache(tmp_path, httpx.Response(200, text=ROBOTS))
+        scraper = WebScraper()
+        
+        with patch('app.core.scraper.robots_cache', cache), patch('httpx.AsyncClient') as mock_client:
+            result = await scraper.scrape('https://example.com/tool-only/page', [ScrapingOption.TEXT])
+        
+        assert result.success is False
+        assert 'robots.txt' in result.error
+        mock_client.assert_not_called()
+    
+    @pytest.mark.asyncio
+    async def test_crawl_delay_widens_rate_limit_interval(self, tmp_path):
+        cache = make_cache(tmp_path, httpx.Response(200, text=ROBOTS))
+        await cache.allowed('https://example.com/')
+        
+        with patch('app.core.scraper.robots_cache', cache), \
+             patch('app.core.scraper.shared_state.reserve_host', return_value=(True, 0.0)) as reserve:
+            await WebScraper()._wait_for_host('https://example.com/page')
+        
+        assert reserve.call_args.args[1] == 5
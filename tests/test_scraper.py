@@ -36,7 +36,8 @@ class TestWebScraper:
             
             result = await self.scraper.scrape(
                 'https://example.com', 
-                [ScrapingOption.TEXT, ScrapingOption.HEADINGS]
+                [ScrapingOption.TEXT, ScrapingOption.HEADINGS],
+                respect_robots=False
             )
             
             assert result.success is True
@@ -52,4 +53,72 @@ class TestWebScraper:
     @pytest.mark.asyncio
     async def test_empty_options(self):
         result = await self.scraper.scrape('https://example.com', [])
-        assert result.success is False
\ No newline at end of file
+        assert result.success is False
+    
+    @pytest.mark.asyncio
+    async def test_scrape_stream_events(self):
+        html_content = """
+        <html>
+            <head><title>Test Page</title></head>
+            <body>
+                <h1>Main Title</h1>
+                <a href="/test">Test Link</a>
+            </body>
+        </html>
+        """
+        
+        with patch('httpx.AsyncClient') as mock_client:
+            mock_response = AsyncMock()
+            mock_response.text = html_content
+            mock_response.content = html_content.encode()
+            mock_response.status_code = 200
+            mock_response.headers = {'content-type': 'text/html'}
+            mock_response.raise_for_status = AsyncMock()
+            
+            mock_client.return_value.__aenter__.return_value.get = AsyncMock(return_value=mock_response)
+            
+            events = [
+                event async for event in self.scraper.scrape_stream(
+                    'https://example.com',
+                    [ScrapingOption.HEADINGS, ScrapingOption.LINKS],
+                    respect_robots=False
+                )
+            ]
+        
+        assert [name for name, _ in events] == ['fetch', 'result', 'result', 'complete']
+        assert events[0][1]['status_code'] == 200
+        assert events[1][1]['field'] == 'headings'
+        assert events[2][1]['field'] == 'links'
+        
+        final = events[-1][1]
+        assert final.success is True
+        assert final.stats['links_count'] == 1
+    
+    @pytest.mark.asyncio
+    async def test_scrape_stream_invalid_url(self):
+        events = [event async for event in self.scraper.scrape_stream('invalid-url', [ScrapingOption.TEXT])]
+        assert len(events) == 1
+        assert events[0][0] == 'complete'
+        assert events[0][1].success is False
+    
+    @pytest.mark.asyncio
+    async def test_batch_queues_urls_per_host(self):
+        from app.core.config import settings
+        running, overlaps = {}, []
+        
+        async def fake_scrape(url, options, render=None, respect_robots=None):
+            host = url.split('/')[2]
+            running[host] = running.get(host, 0) + 1
+            overlaps.append(running[host])
+            await asyncio.sleep(0.01)
+            running[host] -= 1
+            return url
+        
+        urls = [f"https://{host}/{i}" for host in ('a.com', 'b.com') for i in range(3)]
+        with patch.object(self.scraper, 'scrape', fake_scrape), \
+             patch.object(self.scraper, 'prefetch_hosts', AsyncMock()), \
+             patch.object(settings, 'rate_limit_per_minute', 60):
+            results = await self.scraper.scrape_batch(urls, [ScrapingOption.TEXT], concurrency=4, respect_robots=False)
+        
+        assert results == urls
+        assert max(overlaps) == 1
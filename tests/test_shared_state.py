@@ -0,0 +1,80 @@
+# ===========================
+# tests/test_shared_state.py
+# ===========================
+
+import multiprocessing
+import pytest
+from app.core.shared_state import SharedState
+
+def count_scrapes(path, times):
+    state = SharedState(path=str(path))
+    for _ in range(times):
+        state.incr("scrapes_total")
+    state.flush()
+    state.close()
+
+class TestSharedState:
+    def test_counters_are_buffered_until_flush(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        worker, other = SharedState(path=path), SharedState(path=path)
+        
+        worker.incr("scrapes_total")
+        worker.incr("scrapes_total", 2)
+        assert other.counters() == {}
+        
+        worker.flush()
+        assert other.counters() == {"scrapes_total": 3}
+    
+    def test_counters_sum_across_processes(self, tmp_path):
+        path = tmp_path / "state.db"
+        SharedState(path=str(path)).counters()  # create the schema up front
+        
+        processes = [multiprocessing.Process(target=count_scrapes, args=(path, 50)) for _ in range(4)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        
+        assert SharedState(path=str(path)).counters() == {"scrapes_total": 200}
+    
+    def test_reserve_host_spaces_requests(self, tmp_path):
+        path = str(tmp_path / "state.db")
+        worker, other = SharedState(path=path), SharedState(path=path)
+        
+        assert worker.reserve_host("example.com", 10, 30) == (True, 0.0)
+        granted, delay = other.reserve_host("example.com", 10, 30)
+        assert granted and 9 < delay <= 10
+        
+        # Other hosts have their own bucket
+        assert other.reserve_host("example.org", 10, 30) == (True, 0.0)
+    
+    def test_reserve_host_refuses_slots_past_max_wait(self, tmp_path):
+        state = SharedState(path=str(tmp_path / "state.db"))
+        
+        for _ in range(2):
+            assert state.reserve_host("example.com", 10, 15)[0]
+        
+        granted, delay = state.reserve_host("example.com", 10, 15)
+        assert not granted and 19 < delay <= 20
+        # A refused request does not push the next slot further out
+        assert state.reserve_host("example.com", 10, 15) == (False, pytest.approx(delay, abs=0.5))
+    
+    def test_latest_result(self, tmp_path):
+        state = SharedState(path=str(tmp_path / "state.db"))
+        assert state.latest_result("https://example.com/") is None
+        
+        state.record_result("https://example.com/", "/data/first.json")
+        state.record_result("https://example.com/", "/data/second.json")
+        
+        assert state.latest_result("https://example.com/")["path"] == "/data/second.json"
+    
+    def test_worker_metrics(self, tmp_path):
+        state = SharedState(path=str(tmp_path / "state.db"))
+        state.publish_metrics({"dns": {"hits": 3}})
+        
+        workers = state.worker_metrics()
+        assert len(workers) == 1
+        assert next(iter(workers.values()))["dns"] == {"hits": 3}
+        
+        state.retire()
+        assert SharedState(path=str(tmp_path / "state.db")).worker_metrics() == {}
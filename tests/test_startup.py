@@ -0,0 +1,29 @@
+# ===========================
+# tests/test_startup.py
+# ===========================
+
+import subprocess
+import sys
+import pytest
+from app.utils.setup import warm_up
+from app.utils.templates import get_templates
+
+# Loaded on first use or by the startup warm-up, never by `import main`
+LAZY_MODULES = ["bs4", "jinja2", "uvicorn", "selenium"]
+
+class TestStartup:
+    def test_import_main_skips_heavy_dependencies(self):
+        script = f"import sys, main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        assert result.stdout.strip().splitlines()[-1:] in ([], [""])
+
+    def test_templates_are_shared(self):
+        assert get_templates() is get_templates()
+
+    @pytest.mark.asyncio
+    async def test_warm_up_loads_dependencies(self):
+        await warm_up()
+        assert "app.core.parser" in sys.modules
+        assert "app.core.transport" in sys.modules
+        compiled = {name for _, name in get_templates().env.cache.keys()}
+        assert {"base.html", "index.html", "docs.html"} <= compiled